@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Conversion en ligne de commande des images HEIC/HEIF, sans interface graphique.
+
+Utilisation :
+    python convert.py photos/ -o export/ --format jpeg --quality 90 --max-dimension 2048
+    python convert.py image.heic --format webp
+
+Les sous-dossiers sont parcourus et reproduits dans le dossier de sortie
+(sans --output, chaque fichier converti est écrit à côté de sa source).
+Un fichier déjà converti et plus récent que sa source est ignoré : relancer
+la commande reprend un lot interrompu.
+"""
+import argparse
+import multiprocessing
+import sys
+import os
+
+# Ajouter le répertoire parent au chemin de recherche Python
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+# Les processus de conversion réimportent ce module : aucun import de Qt ici
+from src.core.batch_converter import OUTPUT_FORMATS, ConversionOptions, convert_all
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Convertit des images HEIC/HEIF en JPEG, PNG ou WebP")
+    parser.add_argument("inputs", nargs="+", help="Fichiers ou dossiers à convertir")
+    parser.add_argument("-o", "--output", help="Dossier de sortie (par défaut : à côté des sources)")
+    parser.add_argument("-f", "--format", choices=sorted(OUTPUT_FORMATS), default="jpeg")
+    parser.add_argument("-q", "--quality", type=int, default=90, help="Qualité JPEG/WebP (1-100)")
+    parser.add_argument("--max-dimension", type=int, help="Réduit les images dont un côté dépasse cette taille")
+    parser.add_argument("--strip-metadata", action="store_true", help="Ne recopie ni l'EXIF ni le profil ICC")
+    parser.add_argument("--no-recursive", dest="recursive", action="store_false",
+                        help="Ne parcourt pas les sous-dossiers")
+    parser.add_argument("--force", action="store_true", help="Convertit aussi les fichiers déjà à jour")
+    parser.add_argument("-j", "--workers", type=int, help="Nombre de processus (par défaut : nombre de cœurs)")
+    args = parser.parse_args()
+
+    if not 1 <= args.quality <= 100:
+        parser.error("--quality doit être compris entre 1 et 100")
+    if args.max_dimension is not None and args.max_dimension < 1:
+        parser.error("--max-dimension doit être positif")
+
+    options = ConversionOptions(args.format, args.quality, args.max_dimension, not args.strip_metadata)
+    stats = convert_all(args.inputs, options, args.output, args.recursive, args.force, args.workers,
+                        on_progress=lambda stats: print(stats.summary(), flush=True))
+    print(f"Terminé en {stats.elapsed():.1f} s : {stats.summary()}")
+    sys.exit(1 if stats.failed else 0)
+
+
+if __name__ == "__main__":
+    # Exécutable pyinstaller : les processus de travail ne doivent pas relancer le programme
+    multiprocessing.freeze_support()
+    main()
@@ -1,15 +1,18 @@
 #!/usr/bin/env python3
+import multiprocessing
 import sys
 import os
 
 # Ajouter le répertoire parent au chemin de recherche Python
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
-from PyQt6.QtWidgets import QApplication
-from src.ui.main_window import HeicViewer
-from src.ui.theme import apply_theme
-
 def main():
+    # Importés ici : les processus de miniatures réimportent ce module et
+    # doivent rester sans Qt
+    from PyQt6.QtWidgets import QApplication
+    from src.ui.main_window import HeicViewer
+    from src.ui.theme import apply_theme
+    
     app = QApplication(sys.argv)
     
     # Appliquer le thème premium
@@ -20,4 +23,6 @@ def main():
     sys.exit(app.exec())
 
 if __name__ == "__main__":
+    # Exécutable pyinstaller : les processus de travail ne doivent pas relancer le programme
+    multiprocessing.freeze_support()
     main()
@@ -0,0 +1,207 @@
+"""Conversion par lots des images HEIF vers JPEG, PNG ou WebP.
+
+Ce module n'importe pas Qt (voir heif_codec) : il sert à l'outil en ligne
+de commande convert.py et s'exécute dans des processus de travail.
+"""
+import os
+import tempfile
+import time
+from collections import namedtuple
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from PIL import Image, ImageOps
+
+from src.core.heic_scanner import HEIF_EXTENSIONS
+from src.core.heif_codec import draft_for_size
+
+# Format de sortie : (format Pillow, extension, accepte la transparence)
+OUTPUT_FORMATS = {
+    "jpeg": ("JPEG", ".jpg", False),
+    "png": ("PNG", ".png", True),
+    "webp": ("WEBP", ".webp", True),
+}
+
+EXIF_ORIENTATION = 0x0112
+
+# Options d'une conversion ; `max_dimension` à None conserve la taille d'origine
+ConversionOptions = namedtuple("ConversionOptions", "format quality max_dimension keep_metadata")
+
+# Fichiers en cours de conversion par processus : borne la mémoire des
+# travaux planifiés quel que soit le nombre de fichiers à traiter
+IN_FLIGHT_PER_WORKER = 4
+
+
+class ConversionStats:
+    """Compteurs d'un lot de conversion"""
+
+    def __init__(self):
+        self.converted = 0
+        self.up_to_date = 0
+        self.failed = 0
+        self.bytes_written = 0
+        self.started_at = time.perf_counter()
+
+    @property
+    def processed(self):
+        return self.converted + self.up_to_date + self.failed
+
+    def elapsed(self):
+        return time.perf_counter() - self.started_at
+
+    def rate(self):
+        """Fichiers convertis par seconde"""
+        elapsed = self.elapsed()
+        return self.converted / elapsed if elapsed > 0 else 0.0
+
+    def summary(self):
+        return (f"{self.converted} convertis, {self.up_to_date} à jour, {self.failed} erreurs"
+                f" - {self.rate():.1f} fichiers/s, {self.bytes_written / (1024 * 1024):.1f} Mo écrits")
+
+
+def iter_sources(inputs, recursive=True, extensions=HEIF_EXTENSIONS):
+    """Produit (fichier source, dossier de référence) pour chaque image à convertir.
+
+    Les dossiers sont parcourus au fur et à mesure, sans liste complète en
+    mémoire. Le dossier de référence sert à reproduire l'arborescence dans le
+    dossier de sortie ; il vaut None pour un fichier donné directement.
+    """
+    for input_path in inputs:
+        if not os.path.isdir(input_path):
+            yield input_path, None
+            continue
+        pending = [input_path]
+        while pending:
+            directory = pending.pop()
+            try:
+                with os.scandir(directory) as entries:
+                    for entry in entries:
+                        try:
+                            if entry.is_dir(follow_symlinks=False):
+                                if recursive:
+                                    pending.append(entry.path)
+                            elif entry.name.lower().endswith(extensions):
+                                yield entry.path, input_path
+                        except OSError:
+                            continue
+            except OSError as e:
+                print(f"Impossible de lire le dossier {directory}: {e}")
+
+
+def output_path_for(source, root, output_dir, extension):
+    """Chemin du fichier converti, dans `output_dir` ou à côté de la source"""
+    name = os.path.splitext(os.path.basename(source))[0] + extension
+    if output_dir is None:
+        return os.path.join(os.path.dirname(source), name)
+    if root is None:
+        return os.path.join(output_dir, name)
+    relative_directory = os.path.relpath(os.path.dirname(source), root)
+    return os.path.normpath(os.path.join(output_dir, relative_directory, name))
+
+
+def is_up_to_date(source, destination):
+    """Vrai si `destination` existe et n'est pas plus ancien que `source`"""
+    try:
+        return os.stat(destination).st_mtime_ns >= os.stat(source).st_mtime_ns
+    except OSError:
+        return False
+
+
+def convert_file(source, destination, options):
+    """Convertit `source` vers `destination` et retourne la taille écrite.
+
+    L'image est redressée selon son orientation EXIF ; les métadonnées EXIF et
+    le profil ICC sont recopiés si `options.keep_metadata`. L'écriture passe par
+    un fichier temporaire : une conversion interrompue ne laisse jamais un
+    fichier incomplet qui passerait ensuite pour à jour.
+    """
+    pil_format, _, keeps_alpha = OUTPUT_FORMATS[options.format]
+    with Image.open(source) as pil_image:
+        icc_profile = pil_image.info.get("icc_profile")
+        if options.max_dimension:
+            # Vignette intégrée ou décodage réduit lorsqu'ils suffisent
+            draft_for_size(pil_image, options.max_dimension)
+        pil_image.load()
+        exif = pil_image.getexif()
+        if exif.get(EXIF_ORIENTATION, 1) != 1:
+            pil_image = ImageOps.exif_transpose(pil_image)
+            exif = pil_image.getexif()
+        if options.max_dimension:
+            pil_image.thumbnail((options.max_dimension, options.max_dimension),
+                                Image.Resampling.LANCZOS, reducing_gap=1.0)
+        if pil_image.mode not in ("RGB", "L") and not (keeps_alpha and pil_image.mode == "RGBA"):
+            has_alpha = keeps_alpha and ("A" in pil_image.getbands() or "transparency" in pil_image.info)
+            pil_image = pil_image.convert("RGBA" if has_alpha else "RGB")
+
+        save_options = {}
+        if pil_format in ("JPEG", "WEBP"):
+            save_options["quality"] = options.quality
+        if pil_format == "PNG":
+            save_options["compress_level"] = 6
+        if options.keep_metadata:
+            if icc_profile:
+                save_options["icc_profile"] = icc_profile
+            if exif:
+                save_options["exif"] = exif.tobytes()
+
+        directory = os.path.dirname(destination) or "."
+        os.makedirs(directory, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=directory, prefix=".tmp-", suffix=os.path.splitext(destination)[1])
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                pil_image.save(f, pil_format, **save_options)
+            os.replace(temp_path, destination)
+        except BaseException:
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+            raise
+    return os.path.getsize(destination)
+
+
+def convert_all(inputs, options, output_dir=None, recursive=True, force=False,
+                max_workers=None, on_progress=None, progress_interval=2.0):
+    """Convertit toutes les images HEIF de `inputs` dans un groupe de processus.
+
+    Les fichiers sont découverts et soumis au fil de l'eau : au plus
+    IN_FLIGHT_PER_WORKER conversions par processus sont planifiées à la fois.
+    Sauf avec `force`, un fichier dont la sortie est à jour est ignoré, ce qui
+    permet de reprendre un lot interrompu. `on_progress(stats)` est appelé au
+    plus toutes les `progress_interval` secondes. Retourne les compteurs.
+    """
+    extension = OUTPUT_FORMATS[options.format][1]
+    max_workers = max_workers or os.cpu_count() or 1
+    max_in_flight = max_workers * IN_FLIGHT_PER_WORKER
+    stats = ConversionStats()
+    last_progress = time.perf_counter()
+    in_flight = {}
+
+    def collect(futures):
+        for future in futures:
+            source = in_flight.pop(future)
+            try:
+                stats.bytes_written += future.result()
+                stats.converted += 1
+            except Exception as e:
+                stats.failed += 1
+                print(f"Erreur lors de la conversion de {source}: {e}")
+
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        for source, root in iter_sources(inputs, recursive):
+            destination = output_path_for(source, root, output_dir, extension)
+            if not force and is_up_to_date(source, destination):
+                stats.up_to_date += 1
+            else:
+                if len(in_flight) >= max_in_flight:
+                    done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                    collect(done)
+                in_flight[executor.submit(convert_file, source, destination, options)] = source
+            if on_progress and time.perf_counter() - last_progress >= progress_interval:
+                last_progress = time.perf_counter()
+                on_progress(stats)
+        while in_flight:
+            done, _ = wait(in_flight, timeout=progress_interval, return_when=FIRST_COMPLETED)
+            collect(done)
+            if on_progress and time.perf_counter() - last_progress >= progress_interval:
+                last_progress = time.perf_counter()
+                on_progress(stats)
+    return stats
@@ -1,71 +1,329 @@
 import os
 import json
 import time
+import sqlite3
+from contextlib import closing
 from PyQt6.QtCore import QStandardPaths
 
+from src.core.heic_scanner import DirectorySnapshot
+from src.core.write_behind import get_write_queue, write_json_atomic
+
+# Nombre de lignes par requête groupée
+BATCH_SIZE = 1000
+
+
+class _ImageChanges:
+    """Modifications de l'index en attente d'écriture, fusionnables"""
+
+    def __init__(self, clear=False, upserts=None, removals=None, dimensions=None):
+        self.clear = clear
+        # chemin -> (taille, mtime, dossier de recherche)
+        self.upserts = upserts or {}
+        self.removals = removals or set()
+        # chemin -> (largeur, hauteur)
+        self.dimensions = dimensions or {}
+
+    def merge(self, newer):
+        if newer.clear:
+            self.clear = True
+            self.upserts.clear()
+            self.removals.clear()
+            self.dimensions.clear()
+        for path in newer.removals:
+            self.upserts.pop(path, None)
+            self.dimensions.pop(path, None)
+            self.removals.add(path)
+        for path, entry in newer.upserts.items():
+            self.removals.discard(path)
+            previous = self.upserts.get(path)
+            if previous is not None:
+                entry = tuple(new if new is not None else old for new, old in zip(entry, previous))
+            self.upserts[path] = entry
+        self.dimensions.update(newer.dimensions)
+        return self
+
+
 class HeicDataManager:
-    """Gestionnaire pour stocker et récupérer les chemins d'images HEIC"""
-    
+    """Gestionnaire pour stocker et récupérer les chemins d'images HEIC.
+
+    Les images sauvegardées sont indexées dans une base SQLite (mode WAL) avec
+    leur taille, date de modification, dimensions et dossier de recherche.
+    L'ancien fichier saved_images.json est migré au premier démarrage.
+
+    Les écritures passent par une file différée partagée (voir write_behind) :
+    les modifications rapprochées sont fusionnées puis écrites en arrière-plan.
+    """
+
     def __init__(self):
         # Dossier de données de l'application
         app_data_path = QStandardPaths.writableLocation(QStandardPaths.StandardLocation.AppDataLocation)
         self.app_data_dir = os.path.join(app_data_path, "HeicViewer")
         self.images_file = os.path.join(self.app_data_dir, "saved_images.json")
+        self.database_file = os.path.join(self.app_data_dir, "media_index.db")
         self.recent_searches_file = os.path.join(self.app_data_dir, "recent_searches.json")
-        
+
         # Créer le dossier s'il n'existe pas
         os.makedirs(self.app_data_dir, exist_ok=True)
-    
-    def save_images(self, image_paths):
-        """Sauvegarde la liste des chemins d'images"""
-        # Filtrer les chemins qui n'existent plus
-        valid_paths = [path for path in image_paths if os.path.exists(path)]
-        
-        # Structure des données avec timestamp
-        data = {
-            "timestamp": time.time(),
-            "images": valid_paths
-        }
-        
-        try:
-            with open(self.images_file, 'w') as f:
-                json.dump(data, f)
-            return True
-        except Exception as e:
-            print(f"Erreur lors de la sauvegarde des images: {e}")
-            return False
-    
-    def load_images(self):
-        """Charge la liste des chemins d'images"""
+
+        self.write_queue = get_write_queue()
+        self.connection = self._connect()
+        self._create_schema()
+        self._migrate_json_images()
+
+    def _connect(self):
+        connection = sqlite3.connect(self.database_file, timeout=30)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        return connection
+
+    def _create_schema(self):
+        with self.connection:
+            self.connection.execute("""
+                CREATE TABLE IF NOT EXISTS images (
+                    path TEXT PRIMARY KEY,
+                    size INTEGER,
+                    mtime REAL,
+                    width INTEGER,
+                    height INTEGER,
+                    scan_root TEXT,
+                    added_at REAL NOT NULL
+                )
+            """)
+            self.connection.execute("CREATE INDEX IF NOT EXISTS images_scan_root ON images(scan_root)")
+            self.connection.execute("""
+                CREATE TABLE IF NOT EXISTS scan_roots (
+                    root TEXT PRIMARY KEY,
+                    directory_count INTEGER,
+                    file_count INTEGER,
+                    scanned_at REAL NOT NULL
+                )
+            """)
+            # État des dossiers lors du dernier parcours complet de chaque racine
+            self.connection.execute("""
+                CREATE TABLE IF NOT EXISTS snapshot_roots (
+                    root TEXT PRIMARY KEY,
+                    options TEXT NOT NULL,
+                    saved_at REAL NOT NULL
+                )
+            """)
+            self.connection.execute("""
+                CREATE TABLE IF NOT EXISTS snapshot_directories (
+                    root TEXT NOT NULL,
+                    path TEXT NOT NULL,
+                    mtime INTEGER NOT NULL,
+                    files_seen INTEGER NOT NULL,
+                    subdirectories TEXT NOT NULL,
+                    pruned TEXT NOT NULL,
+                    PRIMARY KEY (root, path)
+                )
+            """)
+            self.connection.execute("""
+                CREATE TABLE IF NOT EXISTS snapshot_files (
+                    root TEXT NOT NULL,
+                    directory TEXT NOT NULL,
+                    path TEXT NOT NULL,
+                    size INTEGER,
+                    mtime REAL,
+                    sniffed INTEGER NOT NULL
+                )
+            """)
+            self.connection.execute("CREATE INDEX IF NOT EXISTS snapshot_files_root ON snapshot_files(root)")
+
+    def _migrate_json_images(self):
+        """Importe l'ancienne liste saved_images.json dans la base SQLite"""
         if not os.path.exists(self.images_file):
-            return []
-            
+            return
         try:
             with open(self.images_file, 'r') as f:
                 data = json.load(f)
-                # Vérifier que chaque chemin existe encore
-                valid_images = [path for path in data.get("images", []) if os.path.exists(path)]
-                return valid_images
+            self._write_image_changes(_ImageChanges(
+                upserts={path: (None, None, None) for path in data.get("images", [])}
+            ))
+            os.replace(self.images_file, self.images_file + ".migrated")
+        except Exception as e:
+            print(f"Erreur lors de la migration des images sauvegardées: {e}")
+
+    def save_images(self, image_paths):
+        """Remplace la liste des chemins d'images sauvegardés"""
+        # Filtrer les chemins qui n'existent plus
+        valid_paths = [path for path in image_paths if os.path.exists(path)]
+        self._schedule_image_changes(_ImageChanges(
+            clear=True,
+            upserts={path: (None, None, None) for path in valid_paths}
+        ))
+        return True
+
+    def load_images(self, check_exists=True):
+        """Charge la liste des chemins d'images.
+
+        Avec check_exists=False, la liste est retournée sans vérification :
+        voir PathValidator pour une vérification en arrière-plan.
+        """
+        self.flush()
+        try:
+            cursor = self.connection.execute("SELECT path FROM images ORDER BY rowid")
+            if not check_exists:
+                return [path for (path,) in cursor]
+            # Vérifier que chaque chemin existe encore
+            return [path for (path,) in cursor if os.path.exists(path)]
         except Exception as e:
             print(f"Erreur lors du chargement des images: {e}")
             return []
-    
-    def add_search_result(self, image_paths):
+
+    def add_search_result(self, image_paths, scan_root=None):
         """Ajoute des résultats de recherche à la liste des images sauvegardées"""
-        # Combiner avec les images existantes
-        existing_images = self.load_images()
-        # Utiliser un ensemble pour éviter les doublons
-        combined_images = list(set(existing_images + image_paths))
-        return self.save_images(combined_images)
-    
+        return self.add_image_entries(((path, None, None) for path in image_paths), scan_root)
+
+    def add_image_entries(self, entries, scan_root=None):
+        """Ajoute des images (chemin, taille, mtime), sans doublons"""
+        self._schedule_image_changes(_ImageChanges(
+            upserts={path: (size, mtime, scan_root) for path, size, mtime in entries}
+        ))
+        return True
+
+    def remove_images(self, image_paths):
+        """Retire des chemins de l'index"""
+        self._schedule_image_changes(_ImageChanges(removals=set(image_paths)))
+        return True
+
+    def update_dimensions(self, image_path, width, height):
+        """Enregistre les dimensions d'une image déjà indexée"""
+        self._schedule_image_changes(_ImageChanges(dimensions={image_path: (width, height)}))
+        return True
+
+    def get_image_info(self, image_path):
+        """Retourne les métadonnées indexées d'une image, ou None"""
+        self.flush()
+        row = self.connection.execute(
+            "SELECT path, size, mtime, width, height, scan_root FROM images WHERE path = ?",
+            (image_path,)
+        ).fetchone()
+        if row is None:
+            return None
+        return dict(zip(("path", "size", "mtime", "width", "height", "scan_root"), row))
+
+    def image_count(self):
+        self.flush()
+        return self.connection.execute("SELECT COUNT(*) FROM images").fetchone()[0]
+
+    def get_scan_stats(self, root):
+        """Statistiques du dernier parcours complet de `root`, ou None"""
+        self.flush()
+        row = self.connection.execute(
+            "SELECT directory_count, file_count, scanned_at FROM scan_roots WHERE root = ?",
+            (root,)
+        ).fetchone()
+        if row is None:
+            return None
+        return dict(zip(("directory_count", "file_count", "scanned_at"), row))
+
+    def save_scan_stats(self, root, directory_count, file_count):
+        """Mémorise la taille d'un parcours pour estimer la progression du suivant"""
+        self.write_queue.schedule(("scan_roots", self.database_file, root), self._write_scan_stats,
+                                  (root, directory_count, file_count, time.time()))
+        return True
+
+    def _write_scan_stats(self, stats):
+        with closing(self._connect()) as connection, connection:
+            connection.execute("INSERT OR REPLACE INTO scan_roots VALUES (?, ?, ?, ?)", stats)
+
+    def load_scan_snapshot(self, root, options):
+        """État des dossiers du dernier parcours de `root` ({chemin: DirectorySnapshot}).
+
+        Retourne None si aucun parcours n'a été mémorisé avec les mêmes
+        options (voir HeicScanner.snapshot_options). Utilisable depuis un
+        autre thread (connexion dédiée).
+        """
+        self.flush()
+        with closing(self._connect()) as connection:
+            row = connection.execute("SELECT options FROM snapshot_roots WHERE root = ?",
+                                     (root,)).fetchone()
+            if row is None or row[0] != options:
+                return None
+            files_by_directory = {}
+            for directory, path, size, mtime, sniffed in connection.execute(
+                    "SELECT directory, path, size, mtime, sniffed FROM snapshot_files WHERE root = ?", (root,)):
+                files_by_directory.setdefault(directory, []).append((path, size, mtime, bool(sniffed)))
+            return {
+                path: DirectorySnapshot(mtime, tuple(json.loads(subdirectories)), files_seen,
+                                        tuple(files_by_directory.get(path, ())), tuple(json.loads(pruned)))
+                for path, mtime, files_seen, subdirectories, pruned in connection.execute(
+                    "SELECT path, mtime, files_seen, subdirectories, pruned FROM snapshot_directories"
+                    " WHERE root = ?", (root,))
+            }
+
+    def save_scan_snapshot(self, root, options, snapshot):
+        """Mémorise l'état des dossiers d'un parcours complet, en arrière-plan"""
+        self.write_queue.schedule(("snapshot", self.database_file, root), self._write_scan_snapshot,
+                                  (root, options, snapshot))
+        return True
+
+    def _write_scan_snapshot(self, value):
+        root, options, snapshot = value
+        with closing(self._connect()) as connection, connection:
+            connection.execute("DELETE FROM snapshot_directories WHERE root = ?", (root,))
+            connection.execute("DELETE FROM snapshot_files WHERE root = ?", (root,))
+            connection.execute("INSERT OR REPLACE INTO snapshot_roots VALUES (?, ?, ?)",
+                               (root, options, time.time()))
+            connection.executemany(
+                "INSERT INTO snapshot_directories VALUES (?, ?, ?, ?, ?, ?)",
+                ((root, path, entry.mtime, entry.files_seen, json.dumps(entry.subdirectories),
+                  json.dumps(entry.pruned))
+                 for path, entry in snapshot.items())
+            )
+            connection.executemany(
+                "INSERT INTO snapshot_files VALUES (?, ?, ?, ?, ?, ?)",
+                ((root, directory, path, size, mtime, int(sniffed))
+                 for directory, entry in snapshot.items()
+                 for path, size, mtime, sniffed in entry.files)
+            )
+
+    def flush(self):
+        """Écrit immédiatement les modifications en attente"""
+        self.write_queue.flush()
+
+    def _schedule_image_changes(self, changes):
+        self.write_queue.schedule(("images", self.database_file), self._write_image_changes,
+                                  changes, _ImageChanges.merge)
+
+    def _write_image_changes(self, changes):
+        """Applique des modifications à l'index en une seule transaction"""
+        now = time.time()
+        with closing(self._connect()) as connection, connection:
+            if changes.clear:
+                connection.execute("DELETE FROM images")
+            if changes.removals:
+                connection.executemany("DELETE FROM images WHERE path = ?",
+                                       ((path,) for path in changes.removals))
+            batch = []
+            for path, (size, mtime, scan_root) in changes.upserts.items():
+                batch.append((path, size, mtime, scan_root, now))
+                if len(batch) >= BATCH_SIZE:
+                    self._insert_batch(connection, batch)
+                    batch = []
+            if batch:
+                self._insert_batch(connection, batch)
+            if changes.dimensions:
+                connection.executemany("UPDATE images SET width = ?, height = ? WHERE path = ?",
+                                       ((width, height, path) for path, (width, height)
+                                        in changes.dimensions.items()))
+
+    @staticmethod
+    def _insert_batch(connection, batch):
+        # Un chemin déjà connu garde sa position ; ses métadonnées sont complétées
+        connection.executemany("""
+            INSERT INTO images (path, size, mtime, scan_root, added_at)
+            VALUES (?, ?, ?, ?, ?)
+            ON CONFLICT(path) DO UPDATE SET
+                size = COALESCE(excluded.size, size),
+                mtime = COALESCE(excluded.mtime, mtime),
+                scan_root = COALESCE(excluded.scan_root, scan_root)
+        """, batch)
+
     def save_recent_search(self, search_path):
         """Sauvegarde un chemin de recherche récent"""
         try:
-            if os.path.exists(self.recent_searches_file):
-                with open(self.recent_searches_file, 'r') as f:
-                    searches = json.load(f)
-            else:
-                searches = []
+            searches = self._read_recent_searches()
                 
             # Ajouter le nouveau chemin en tête de liste s'il n'y est pas déjà
             if search_path in searches:
@@ -75,8 +333,9 @@ class HeicDataManager:
             # Limiter à 10 chemins récents
             searches = searches[:10]
             
-            with open(self.recent_searches_file, 'w') as f:
-                json.dump(searches, f)
+            # Écriture atomique et différée
+            self.write_queue.schedule(("recent_searches", self.recent_searches_file),
+                                      self._write_recent_searches, searches)
             return True
         except Exception as e:
             print(f"Erreur lors de la sauvegarde des recherches récentes: {e}")
@@ -84,14 +343,23 @@ class HeicDataManager:
     
     def get_recent_searches(self):
         """Récupère les chemins de recherche récents"""
-        if not os.path.exists(self.recent_searches_file):
-            return []
-            
         try:
-            with open(self.recent_searches_file, 'r') as f:
-                searches = json.load(f)
-                # Vérifier que chaque chemin existe encore
-                return [path for path in searches if os.path.exists(os.path.dirname(path))]
+            searches = self._read_recent_searches()
+            # Vérifier que chaque chemin existe encore
+            return [path for path in searches if os.path.exists(os.path.dirname(path))]
         except Exception as e:
             print(f"Erreur lors du chargement des recherches récentes: {e}")
             return []
+
+    def _read_recent_searches(self):
+        """Recherches récentes, y compris une écriture encore en attente"""
+        pending = self.write_queue.pending_value(("recent_searches", self.recent_searches_file))
+        if pending is not None:
+            return list(pending)
+        if not os.path.exists(self.recent_searches_file):
+            return []
+        with open(self.recent_searches_file, 'r') as f:
+            return json.load(f)
+
+    def _write_recent_searches(self, searches):
+        write_json_atomic(self.recent_searches_file, searches)
@@ -0,0 +1,134 @@
+import os
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from PyQt6.QtCore import QObject, QFileSystemWatcher, QTimer, pyqtSignal
+
+from src.core.heic_scanner import HEIF_EXTENSIONS
+from src.core.heif_sniffer import SNIFF_EXTENSIONS, sniff_many
+from src.core.playlist import Playlist
+
+class DirectoryIndex(QObject):
+    """Listes triées des images HEIC par dossier, tenues à jour en continu.
+
+    Chaque dossier n'est lu qu'une seule fois puis surveillé par un
+    QFileSystemWatcher : la navigation ne relit jamais le disque, et les
+    ajouts ou suppressions externes sont appliqués dès qu'ils surviennent.
+    Avec `sniff_content`, les fichiers JPEG/PNG/TIFF dont l'en-tête est HEIF
+    sont aussi retenus ; le verdict de chaque fichier est conservé avec sa
+    date de modification, et une relecture du dossier ne lit que les en-têtes
+    des fichiers nouveaux ou modifiés.
+    """
+    # dossier, fichiers ajoutés, fichiers supprimés
+    directory_changed = pyqtSignal(str, list, list)
+
+    def __init__(self, max_directories=8, sniff_content=False, parent=None):
+        super().__init__(parent)
+        self.max_directories = max_directories
+        self.sniff_content = sniff_content
+        self._sniff_executor = None
+        self._listings = OrderedDict()
+        # Par dossier : {chemin: (mtime en ns, fichier HEIF)}
+        self._sniff_verdicts = {}
+        self._pending_changes = set()
+        self._watcher = QFileSystemWatcher(self)
+        self._watcher.directoryChanged.connect(self._on_directory_changed)
+        # Regroupe les notifications en rafale (copie de nombreux fichiers)
+        self._change_timer = QTimer(self)
+        self._change_timer.setSingleShot(True)
+        self._change_timer.setInterval(200)
+        self._change_timer.timeout.connect(self._apply_pending_changes)
+
+    def files_in(self, directory):
+        """Retourne la liste triée (Playlist) des images HEIC de `directory`"""
+        listing = self._listings.get(directory)
+        if listing is not None:
+            self._listings.move_to_end(directory)
+            return listing
+
+        listing = self._scan(directory)
+        self._listings[directory] = listing
+        self._watcher.addPath(directory)
+        # Limiter le nombre de dossiers surveillés
+        while len(self._listings) > self.max_directories:
+            old_directory, _ = self._listings.popitem(last=False)
+            self._sniff_verdicts.pop(old_directory, None)
+            self._watcher.removePath(old_directory)
+        return listing
+
+    def set_sniff_content(self, enabled):
+        """Active la détection par le contenu ; les dossiers seront relus"""
+        if enabled == self.sniff_content:
+            return
+        self.sniff_content = enabled
+        for directory in self._listings:
+            self._watcher.removePath(directory)
+        self._listings.clear()
+        self._sniff_verdicts.clear()
+
+    def shutdown(self):
+        if self._sniff_executor is not None:
+            self._sniff_executor.shutdown(wait=False, cancel_futures=True)
+            self._sniff_executor = None
+
+    def _scan(self, directory):
+        files = []
+        previous_verdicts = self._sniff_verdicts.get(directory, {})
+        verdicts = {}
+        candidates = {}
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                name = entry.name.lower()
+                if name.endswith(HEIF_EXTENSIONS) and entry.is_file():
+                    files.append(os.path.join(directory, entry.name))
+                elif self.sniff_content and name.endswith(SNIFF_EXTENSIONS):
+                    path = os.path.join(directory, entry.name)
+                    try:
+                        mtime = entry.stat().st_mtime_ns
+                    except OSError:
+                        continue
+                    previous = previous_verdicts.get(path)
+                    if previous is not None and previous[0] == mtime:
+                        verdicts[path] = previous
+                    else:
+                        candidates[path] = mtime
+        if candidates:
+            if self._sniff_executor is None:
+                self._sniff_executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix="sniff")
+            matches = set(sniff_many(list(candidates), self._sniff_executor))
+            for path, mtime in candidates.items():
+                verdicts[path] = (mtime, path in matches)
+        if self.sniff_content:
+            self._sniff_verdicts[directory] = verdicts
+            files.extend(path for path, (_, is_heif) in verdicts.items() if is_heif)
+        files.sort()
+        return Playlist(files)
+
+    def _on_directory_changed(self, directory):
+        if directory in self._listings:
+            self._pending_changes.add(directory)
+            self._change_timer.start()
+
+    def _apply_pending_changes(self):
+        directories, self._pending_changes = self._pending_changes, set()
+        for directory in directories:
+            old_listing = self._listings.get(directory)
+            if old_listing is None:
+                continue
+            try:
+                new_files = set(self._scan(directory))
+            except OSError:
+                # Dossier supprimé ou devenu inaccessible
+                new_files = set()
+                del self._listings[directory]
+                self._sniff_verdicts.pop(directory, None)
+                self._watcher.removePath(directory)
+            old_files = set(old_listing)
+            added = sorted(new_files - old_files)
+            removed = sorted(old_files - new_files)
+            # La liste existante est modifiée sur place : les vues qui la
+            # partagent restent à jour sans nouvelle lecture
+            old_listing.remove_many(removed)
+            for path in added:
+                old_listing.insert_sorted(path)
+            if added or removed:
+                self.directory_changed.emit(directory, added, removed)
@@ -0,0 +1,320 @@
+import os
+import threading
+import time
+from collections import Counter, deque, namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+from src.core.heif_sniffer import SNIFF_EXTENSIONS, sniff_many
+
+HEIF_EXTENSIONS = ('.heic', '.heif', '.hif', '.avif')
+
+# État d'un dossier lors d'un parcours : mtime (ns), sous-dossiers, nombre de
+# fichiers vus, fichiers HEIF trouvés sous forme (chemin, taille, mtime, détecté
+# par le contenu) et raisons d'exclusion des sous-dossiers ignorés
+DirectorySnapshot = namedtuple("DirectorySnapshot", "mtime subdirectories files_seen files pruned")
+
+# Un dossier modifié il y a moins de 2 s n'est pas mémorisé : sur les systèmes
+# de fichiers à horodatage grossier, un ajout ultérieur ne changerait pas sa mtime
+SNAPSHOT_RACY_WINDOW_NS = 2 * 10**9
+
+class ScanStats:
+    """Compteurs d'une recherche en cours ou terminée, ou d'un seul dossier"""
+
+    def __init__(self, dirs_discovered=1):
+        self.dirs_discovered = dirs_discovered
+        self.dirs_done = 0
+        self.files_seen = 0
+        self.matches = 0
+        self.errors = 0
+        # Détection par le contenu : fichiers lus, et fichiers HEIF ainsi reconnus
+        self.files_sniffed = 0
+        self.sniff_matches = 0
+        # Dossiers inchangés depuis le parcours précédent, repris sans relecture
+        self.dirs_reused = 0
+        # Sous-dossiers exclus par les règles, par raison
+        self.dirs_pruned = Counter()
+
+    @property
+    def extension_matches(self):
+        return self.matches - self.sniff_matches
+
+    def add(self, other):
+        self.dirs_discovered += other.dirs_discovered
+        self.dirs_done += other.dirs_done
+        self.files_seen += other.files_seen
+        self.matches += other.matches
+        self.errors += other.errors
+        self.files_sniffed += other.files_sniffed
+        self.sniff_matches += other.sniff_matches
+        self.dirs_reused += other.dirs_reused
+        self.dirs_pruned.update(other.dirs_pruned)
+
+
+class HeicScanner:
+    """Recherche de fichiers HEIC en un seul passage os.scandir.
+
+    Les résultats sont transmis dès qu'ils sont trouvés. La progression est
+    estimée à partir des dossiers terminés par rapport aux dossiers découverts,
+    ou par rapport au nombre de dossiers du précédent parcours de la même
+    racine lorsqu'il est connu.
+
+    Avec `sniff_content`, les fichiers dont l'extension figure dans
+    SNIFF_EXTENSIONS sont aussi identifiés par leur en-tête (boîte ftyp) ;
+    les en-têtes d'un même dossier sont lus en parallèle.
+
+    `snapshot` est l'état des dossiers ({chemin: DirectorySnapshot}) relevé
+    par un parcours précédent : un dossier dont la mtime n'a pas changé n'est
+    pas relu, ses sous-dossiers et ses fichiers sont repris tels quels. Le
+    nouvel état est relevé dans `new_snapshot` pendant le parcours.
+
+    `prune_rules` (PruneRules) écarte des sous-dossiers dès la lecture de
+    leur entrée : ils ne sont jamais ouverts.
+    """
+
+    def __init__(self, root_path, recursive=True, expected_directories=None, sniff_content=False,
+                 sniff_workers=8, snapshot=None, prune_rules=None):
+        self.root_path = root_path
+        self.recursive = recursive
+        self.prune_rules = prune_rules
+        self.expected_directories = expected_directories
+        self.sniff_content = sniff_content
+        self.sniff_workers = sniff_workers
+        self.snapshot = snapshot
+        self.new_snapshot = {}
+        self.stats = ScanStats()
+        self._cancelled = threading.Event()
+        self._sniff_executor = None
+
+    def cancel(self):
+        self._cancelled.set()
+
+    def is_cancelled(self):
+        return self._cancelled.is_set()
+
+    def snapshot_options(self):
+        """Options dont dépend le résultat d'un parcours ; un état mémorisé
+        n'est réutilisable qu'avec les mêmes options"""
+        prune = self.prune_rules.signature() if self.prune_rules else ""
+        return f"sniff={int(bool(self.sniff_content))};prune={prune}"
+
+    def progress(self):
+        """Progression estimée, en pourcentage"""
+        total = self.stats.dirs_discovered
+        if self.expected_directories:
+            total = max(total, self.expected_directories)
+        return min(99, int(self.stats.dirs_done * 100 / total)) if total else 0
+
+    def scan(self, on_match, on_progress=None, progress_interval=0.1):
+        """Parcourt l'arborescence et appelle `on_match(chemin, taille, mtime)` pour chaque fichier HEIC.
+
+        `on_progress(scanner)` est appelé au plus toutes les `progress_interval`
+        secondes. Retourne les statistiques du parcours.
+        """
+        stack = [self.root_path]
+        last_progress = time.monotonic()
+        self._start_scan()
+        try:
+            while stack and not self.is_cancelled():
+                directory = stack.pop()
+                subdirectories, counts = self._scan_directory(directory, on_match)
+                stack.extend(subdirectories)
+                self.stats.add(counts)
+                if on_progress and time.monotonic() - last_progress >= progress_interval:
+                    last_progress = time.monotonic()
+                    on_progress(self)
+        finally:
+            self._stop_sniffing()
+        return self.stats
+
+    def _start_scan(self):
+        if self.prune_rules:
+            self.prune_rules.set_root(self.root_path)
+        if self.sniff_content:
+            self._sniff_executor = ThreadPoolExecutor(max_workers=self.sniff_workers,
+                                                      thread_name_prefix="sniff")
+
+    def _stop_sniffing(self):
+        if self._sniff_executor is not None:
+            self._sniff_executor.shutdown(wait=False, cancel_futures=True)
+            self._sniff_executor = None
+
+    def _scan_directory(self, directory, on_match):
+        """Traite un dossier ; retourne (sous-dossiers, compteurs du dossier)"""
+        counts = ScanStats(dirs_discovered=0)
+        counts.dirs_done = 1
+        try:
+            mtime = os.stat(directory).st_mtime_ns
+        except OSError:
+            counts.errors = 1
+            return [], counts
+
+        previous = self.snapshot.get(directory) if self.snapshot else None
+        if previous is not None and previous.mtime == mtime:
+            self.new_snapshot[directory] = previous
+            for path, size, file_mtime, sniffed in previous.files:
+                counts.sniff_matches += sniffed
+                on_match(path, size, file_mtime)
+            counts.dirs_discovered = len(previous.subdirectories)
+            counts.files_seen = previous.files_seen
+            counts.matches = len(previous.files)
+            counts.dirs_reused = 1
+            counts.dirs_pruned.update(previous.pruned)
+            return list(previous.subdirectories), counts
+
+        files = []
+
+        def on_file(path, size, file_mtime, sniffed):
+            files.append((path, size, file_mtime, sniffed))
+            on_match(path, size, file_mtime)
+
+        subdirectories, pruned = self._read_directory(directory, on_file, counts)
+        counts.dirs_discovered = len(subdirectories)
+        counts.dirs_pruned.update(pruned)
+        if not counts.errors and not self.is_cancelled() and time.time_ns() - mtime > SNAPSHOT_RACY_WINDOW_NS:
+            self.new_snapshot[directory] = DirectorySnapshot(mtime, tuple(subdirectories), counts.files_seen,
+                                                             tuple(files), tuple(pruned))
+        return subdirectories, counts
+
+    def _depth(self, directory):
+        """Nombre de niveaux entre la racine et `directory`"""
+        relative = directory[len(self.root_path):].strip(os.sep)
+        return relative.count(os.sep) + 1 if relative else 0
+
+    def _read_directory(self, directory, on_file, counts):
+        """Lit un dossier en complétant `counts` ; retourne (sous-dossiers,
+        raisons d'exclusion des sous-dossiers ignorés)"""
+        subdirectories = []
+        pruned = []
+        candidates = {}
+        try:
+            entries = self._list_directory(directory)
+        except OSError:
+            counts.errors += 1
+            return subdirectories, pruned
+        depth = self._depth(directory) + 1 if self.prune_rules else 0
+        for entry in entries:
+            if self.is_cancelled():
+                break
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    if not self.recursive:
+                        continue
+                    reason = self.prune_rules.prune_reason(entry, depth) if self.prune_rules else None
+                    if reason:
+                        pruned.append(reason)
+                    else:
+                        subdirectories.append(entry.path)
+                    continue
+                counts.files_seen += 1
+                name = entry.name.lower()
+                if name.endswith(HEIF_EXTENSIONS) and entry.is_file():
+                    stat = entry.stat()
+                    counts.matches += 1
+                    on_file(entry.path, stat.st_size, stat.st_mtime, False)
+                elif self._sniff_executor is not None and name.endswith(SNIFF_EXTENSIONS):
+                    candidates[entry.path] = entry
+            except OSError:
+                counts.errors += 1
+
+        counts.files_sniffed = len(candidates)
+        if candidates and not self.is_cancelled():
+            for path in sniff_many(list(candidates), self._sniff_executor):
+                try:
+                    stat = candidates[path].stat()
+                except OSError:
+                    counts.errors += 1
+                    continue
+                counts.matches += 1
+                counts.sniff_matches += 1
+                on_file(path, stat.st_size, stat.st_mtime, True)
+        return subdirectories, pruned
+
+    def _list_directory(self, directory):
+        # La liste est lue entièrement pour libérer le descripteur avant de descendre
+        with os.scandir(directory) as entries:
+            return list(entries)
+
+
+class ParallelHeicScanner(HeicScanner):
+    """Recherche parallèle avec vol de travail, pour les grands arbres et les montages lents.
+
+    Chaque thread dépile les dossiers de sa propre file (en profondeur
+    d'abord) ; un thread inactif vole le dossier le plus ancien de la file
+    d'un autre. Plusieurs lectures de dossier sont ainsi en vol en même temps,
+    ce qui masque la latence des partages SMB/NFS. `on_match` est appelé
+    depuis les threads de travail ; une exception levée dans un thread arrête
+    le parcours et est relancée par `scan`.
+    """
+
+    def __init__(self, root_path, recursive=True, expected_directories=None, sniff_content=False,
+                 workers=8, snapshot=None, prune_rules=None):
+        super().__init__(root_path, recursive, expected_directories, sniff_content, workers, snapshot,
+                         prune_rules)
+        self.workers = max(1, workers)
+        self._lock = threading.Lock()
+        self._queues = [deque() for _ in range(self.workers)]
+        self._outstanding = 0
+        self._finished = threading.Event()
+        self._error = None
+
+    def scan(self, on_match, on_progress=None, progress_interval=0.1):
+        self._queues[0].append(self.root_path)
+        self._outstanding = 1
+        threads = [threading.Thread(target=self._work, args=(index, on_match), daemon=True)
+                   for index in range(self.workers)]
+        self._start_scan()
+        try:
+            for thread in threads:
+                thread.start()
+            while not self._finished.wait(progress_interval):
+                if self.is_cancelled():
+                    break
+                if on_progress:
+                    on_progress(self)
+            for thread in threads:
+                thread.join()
+        finally:
+            self._stop_sniffing()
+        if self._error is not None:
+            raise self._error
+        return self.stats
+
+    def _work(self, index, on_match):
+        own_queue = self._queues[index]
+        while not self._finished.is_set() and not self.is_cancelled():
+            directory = self._next_directory(index)
+            if directory is None:
+                # Rien à voler pour l'instant : d'autres threads lisent encore
+                self._finished.wait(0.002)
+                continue
+            try:
+                subdirectories, counts = self._scan_directory(directory, on_match)
+                # Les sous-dossiers sont comptés avant d'être publiés : un autre
+                # thread peut les voler et les terminer aussitôt
+                with self._lock:
+                    self.stats.add(counts)
+                    self._outstanding += len(subdirectories)
+                own_queue.extend(subdirectories)
+            except BaseException as e:
+                with self._lock:
+                    if self._error is None:
+                        self._error = e
+                self._finished.set()
+                return
+            finally:
+                with self._lock:
+                    self._outstanding -= 1
+                    if self._outstanding == 0:
+                        self._finished.set()
+
+    def _next_directory(self, index):
+        try:
+            return self._queues[index].pop()
+        except IndexError:
+            pass
+        for offset in range(1, self.workers):
+            try:
+                return self._queues[(index + offset) % self.workers].popleft()
+            except IndexError:
+                continue
+        return None
@@ -0,0 +1,66 @@
+"""Décodage HEIF/HEIC avec Pillow et pillow_heif uniquement.
+
+Ce module n'importe pas Qt : il est utilisable dans les processus de
+génération de miniatures et dans les outils en ligne de commande.
+"""
+from PIL import Image
+import pillow_heif
+
+from src.core.thumbnail_cache import size_class
+
+pillow_heif.register_heif_opener()
+
+
+def decode_thumbnail(file_path, size):
+    """Décode une miniature tenant dans un carré de `size` pixels.
+
+    La vignette intégrée au fichier HEIC est utilisée lorsqu'elle est au moins
+    aussi grande que la taille demandée ; sinon l'image est décodée puis réduite.
+    Retourne l'image PIL et un booléen indiquant si la vignette intégrée a servi.
+    """
+    pil_image = Image.open(file_path)
+    from_embedded = draft_for_size(pil_image, size)
+    pil_image.thumbnail((size, size), Image.Resampling.LANCZOS)
+    return pil_image, from_embedded
+
+
+def draft_for_size(pil_image, size):
+    """Configure le chargement réduit le plus léger couvrant un carré de `size` pixels"""
+    width, height = pil_image.size
+    scale = min(size / width, size / height, 1.0)
+    fitted_size = (max(1, round(width * scale)), max(1, round(height * scale)))
+    # Image.draft sélectionne la vignette intégrée (HEIC) ou une réduction DCT (JPEG)
+    return pil_image.draft(None, fitted_size) is not None
+
+
+def render_thumbnail(file_path, size, cache=None):
+    """Miniature PIL de `file_path`, lue dans le ThumbnailCache `cache` si possible.
+
+    En cas d'absence, l'image est décodée à la taille de sa classe, enregistrée
+    dans le cache pour les sessions suivantes, puis réduite à `size`.
+    """
+    if cache is None:
+        pil_image, _ = decode_thumbnail(file_path, size)
+        return pil_image
+    pil_image = cache.get(file_path, size)
+    if pil_image is not None:
+        return pil_image
+    cache_size = size_class(size) or size
+    pil_image, _ = decode_thumbnail(file_path, cache_size)
+    cache.put(file_path, pil_image, size)
+    if cache_size != size:
+        pil_image.thumbnail((size, size), Image.Resampling.LANCZOS)
+    return pil_image
+
+
+def to_buffer(pil_image):
+    """Pixels bruts compacts d'une image : (mode, (largeur, hauteur), octets)"""
+    if pil_image.mode not in ("RGB", "RGBA", "L"):
+        has_alpha = "A" in pil_image.getbands() or "transparency" in pil_image.info
+        pil_image = pil_image.convert("RGBA" if has_alpha else "RGB")
+    return pil_image.mode, pil_image.size, pil_image.tobytes()
+
+
+def from_buffer(buffer):
+    mode, size, data = buffer
+    return Image.frombytes(mode, size, data)
@@ -0,0 +1,44 @@
+import struct
+
+# Marques ISO-BMFF (boîte ftyp) désignant un fichier HEIF, HEIC ou AVIF
+HEIF_BRANDS = frozenset((
+    b"heic", b"heix", b"heim", b"heis",
+    b"hevc", b"hevx", b"hevm", b"hevs",
+    b"mif1", b"msf1", b"miaf",
+    b"avif", b"avis",
+))
+
+# Extensions dont le contenu est vérifié en mode détection par le contenu :
+# certains outils d'export enregistrent du HEIF sous une extension JPEG
+SNIFF_EXTENSIONS = ('.jpg', '.jpeg', '.jpe', '.jfif', '.png', '.tif', '.tiff')
+
+# Octets lus en tête de fichier : la boîte ftyp et ses premières marques
+SNIFF_BYTES = 64
+
+
+def is_heif_header(data):
+    """Indique si `data` commence par une boîte ftyp annonçant une marque HEIF"""
+    if len(data) < 16 or data[4:8] != b"ftyp":
+        return False
+    box_size = struct.unpack(">I", data[:4])[0]
+    if box_size < 16:
+        return False
+    end = min(box_size, len(data))
+    # Marque principale, puis marques compatibles après la version mineure
+    if data[8:12] in HEIF_BRANDS:
+        return True
+    return any(data[offset:offset + 4] in HEIF_BRANDS for offset in range(16, end - 3, 4))
+
+
+def sniff_heif(file_path):
+    """Lit l'en-tête de `file_path` ; retourne True pour un fichier HEIF"""
+    try:
+        with open(file_path, 'rb') as f:
+            return is_heif_header(f.read(SNIFF_BYTES))
+    except OSError:
+        return False
+
+
+def sniff_many(file_paths, executor):
+    """Vérifie un lot de fichiers en parallèle ; retourne les chemins HEIF"""
+    return [path for path, is_heif in zip(file_paths, executor.map(sniff_heif, file_paths)) if is_heif]
@@ -0,0 +1,118 @@
+import os
+import threading
+from collections import OrderedDict
+
+class ImageCache:
+    """Cache LRU des images décodées, borné par un budget mémoire en Mo.
+
+    Les entrées sont indexées par (chemin, mtime, taille, variante) : un
+    fichier modifié sur le disque n'est donc jamais servi depuis une ancienne
+    version. La variante distingue la pleine résolution (None) des versions
+    réduites pour l'ajustement à la fenêtre (taille maximale en pixels).
+    """
+
+    def __init__(self, max_memory_mb=512):
+        self.max_memory_bytes = int(max_memory_mb * 1024 * 1024)
+        self.memory_used = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._keys_by_path = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(file_path, variant=None):
+        """Construit la clé de cache d'un fichier, ou None s'il est inaccessible"""
+        try:
+            stat = os.stat(file_path)
+        except OSError:
+            return None
+        return (os.path.abspath(file_path), stat.st_mtime_ns, stat.st_size, variant)
+
+    @staticmethod
+    def with_variant(key, variant):
+        """Même fichier et même version, autre variante"""
+        return key[:3] + (variant,) if key else None
+
+    def get(self, file_path, key=None):
+        """Retourne l'image en cache pour ce fichier, ou None"""
+        key = key or self.make_key(file_path)
+        with self._lock:
+            entry = self._entries.get(key) if key else None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, file_path, image, key=None):
+        """Ajoute une image décodée (QImage) au cache.
+
+        `key` peut être calculée avant le décodage pour éviter d'associer une
+        image à une version plus récente du fichier.
+        """
+        key = key or self.make_key(file_path)
+        if key is None or image is None:
+            return False
+        cost = image.sizeInBytes()
+        if cost > self.max_memory_bytes:
+            return False
+        with self._lock:
+            # Une seule version par chemin et variante : l'ancienne est obsolète
+            previous_key = self._keys_by_path.get(_slot(key))
+            if previous_key is not None:
+                self._remove(previous_key)
+            self._entries[key] = (image, cost)
+            self._keys_by_path[_slot(key)] = key
+            self.memory_used += cost
+            self._evict()
+        return True
+
+    def contains(self, file_path, key=None):
+        """Indique si le fichier est en cache sans modifier les compteurs"""
+        key = key or self.make_key(file_path)
+        with self._lock:
+            return key in self._entries
+
+    def set_max_memory(self, max_memory_mb):
+        """Modifie le budget mémoire et évince si nécessaire"""
+        with self._lock:
+            self.max_memory_bytes = int(max_memory_mb * 1024 * 1024)
+            self._evict()
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._keys_by_path.clear()
+            self.memory_used = 0
+
+    def stats(self):
+        """Retourne les compteurs du cache"""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "memory_mb": self.memory_used / (1024 * 1024),
+                "max_memory_mb": self.max_memory_bytes / (1024 * 1024),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / total if total else 0.0,
+            }
+
+    def _remove(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.memory_used -= entry[1]
+            if self._keys_by_path.get(_slot(key)) == key:
+                del self._keys_by_path[_slot(key)]
+
+    def _evict(self):
+        while self.memory_used > self.max_memory_bytes and self._entries:
+            oldest_key = next(iter(self._entries))
+            self._remove(oldest_key)
+
+
+def _slot(key):
+    # Chemin et variante : une entrée au plus par combinaison
+    return key[0], key[3]
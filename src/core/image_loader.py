@@ -0,0 +1,115 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from PyQt6.QtCore import QObject, QSize, pyqtSignal
+from PyQt6.QtGui import QImage
+
+from src.core.image_processing import (decode_fitted, decode_image, decode_preview, full_size_of,
+                                         is_full_resolution)
+
+# Les tailles d'ajustement sont arrondies à ce pas : un léger redimensionnement
+# de la fenêtre réutilise la version réduite déjà en cache
+FIT_SIZE_STEP = 256
+
+def fit_variant(target_size):
+    """Variante de cache (taille de décodage) pour une taille d'ajustement, None : pleine résolution"""
+    if not target_size:
+        return None
+    return -(-target_size // FIT_SIZE_STEP) * FIT_SIZE_STEP
+
+class AsyncImageLoader(QObject):
+    """Charge les images hors du thread principal.
+
+    Chaque demande reçoit un identifiant croissant : une nouvelle demande annule
+    les demandes plus anciennes encore en attente, et les résultats obsolètes
+    arrivés malgré tout ne sont jamais émis.
+
+    Lorsqu'une taille d'aperçu est demandée et que l'image n'est pas en cache,
+    un aperçu rapide (`preview_loaded`, avec la taille pleine résolution) est
+    émis avant l'image complète.
+
+    Avec une taille cible (`target_size`), l'image est décodée réduite pour
+    tenir dans ce carré ; la pleine résolution n'est demandée qu'au besoin.
+    `image_loaded` porte toujours la taille pleine résolution de l'image.
+    """
+    preview_loaded = pyqtSignal(int, str, QImage, QSize)
+    image_loaded = pyqtSignal(int, str, QImage, QSize)
+    load_failed = pyqtSignal(int, str, str)
+
+    def __init__(self, image_cache, prefetcher=None, max_workers=2, parent=None):
+        super().__init__(parent)
+        self.image_cache = image_cache
+        self.prefetcher = prefetcher
+        self.latest_request_id = 0
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="image-loader")
+        self._futures = {}
+        self._lock = threading.Lock()
+
+    def request(self, file_path, quality=100, preview_size=None, target_size=None):
+        """Demande le chargement de `file_path` et retourne l'identifiant de la demande"""
+        with self._lock:
+            self.latest_request_id += 1
+            request_id = self.latest_request_id
+            for future in self._futures.values():
+                future.cancel()
+            self._futures = {}
+            future = self._executor.submit(self._load, request_id, file_path, quality, preview_size,
+                                          fit_variant(target_size))
+            self._futures[request_id] = future
+        return request_id
+
+    def is_current(self, request_id):
+        return request_id == self.latest_request_id
+
+    def shutdown(self):
+        with self._lock:
+            self.latest_request_id += 1
+            self._futures = {}
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _load(self, request_id, file_path, quality, preview_size, variant):
+        if not self.is_current(request_id):
+            return
+        try:
+            full_key = self.image_cache.make_key(file_path)
+            cache_key = full_key
+            if variant is not None and not self.image_cache.contains(file_path, full_key):
+                # La pleine résolution, si elle est déjà là, sert aussi l'ajustement ;
+                # seule la clé réellement lue compte dans les statistiques du cache
+                cache_key = self.image_cache.with_variant(full_key, variant)
+            image = self.image_cache.get(file_path, cache_key)
+            if image is None and self.prefetcher is not None:
+                image = self.prefetcher.take(file_path)
+                if image is not None and variant is None and not is_full_resolution(image):
+                    image = None
+            if image is None:
+                if preview_size:
+                    self._load_preview(request_id, file_path, preview_size)
+                if variant is None:
+                    image = decode_image(file_path, quality)
+                else:
+                    image = decode_fitted(file_path, variant, quality)
+                # Une image assez petite pour être décodée entière est rangée en pleine résolution
+                if is_full_resolution(image):
+                    cache_key = full_key
+                else:
+                    cache_key = self.image_cache.with_variant(full_key, variant)
+                self.image_cache.put(file_path, image, cache_key)
+        except Exception as e:
+            if self.is_current(request_id):
+                self.load_failed.emit(request_id, file_path, str(e))
+            return
+        finally:
+            with self._lock:
+                self._futures.pop(request_id, None)
+
+        if self.is_current(request_id):
+            self.image_loaded.emit(request_id, file_path, image, full_size_of(image))
+
+    def _load_preview(self, request_id, file_path, preview_size):
+        try:
+            preview, full_size = decode_preview(file_path, preview_size)
+        except Exception as e:
+            print(f"Erreur lors du chargement de l'aperçu de {file_path}: {e}")
+            return
+        if preview is not None and self.is_current(request_id):
+            self.preview_loaded.emit(request_id, file_path, preview, QSize(*full_size))
@@ -1,51 +1,145 @@
-import io
 import os
 import sys  # Ajout de cet import
-from PyQt6.QtCore import QStandardPaths
-from PyQt6.QtGui import QPixmap, QImage
+from PyQt6.QtCore import QSize, QStandardPaths
+from PyQt6.QtGui import QImage
 from PIL import Image
-import pillow_heif
 
-pillow_heif.register_heif_opener()
+# Le décodage PIL pur (sans Qt) est partagé avec les processus de miniatures
+from src.core.heif_codec import draft_for_size
 
-def load_image(file_path, quality=100):
-    pil_image = Image.open(file_path)
-    pixmap = convert_pil_to_pixmap(pil_image, quality)
-    
-    return pil_image, pixmap
+# Chemins de conversion possibles entre PIL et Qt
+CONVERSION_DIRECT = "direct"
+CONVERSION_CONVERTED = "conversion"
+CONVERSION_TEMP_FILE = "fichier temporaire"
 
-def convert_pil_to_pixmap(pil_image, quality=100):
-    try:
+# Chemins lents déjà signalés, par (mode PIL, chemin de conversion)
+_reported_conversions = set()
+
+# Modes PIL pouvant être enveloppés directement dans une QImage (format, octets par pixel)
+_QIMAGE_FORMATS = {
+    "RGB": (QImage.Format.Format_RGB888, 3),
+    "RGBA": (QImage.Format.Format_RGBA8888, 4),
+    "RGBX": (QImage.Format.Format_RGBX8888, 4),
+    "L": (QImage.Format.Format_Grayscale8, 1),
+}
+
+# Texte de QImage portant la taille pleine résolution d'une image réduite
+FULL_SIZE_KEY = "HeicViewer-full-size"
+
+def convert_pil_to_qimage(pil_image, quality=100):
+    """Convertit une image PIL en QImage et indique le chemin de conversion utilisé.
+
+    Les modes courants sont enveloppés directement dans une QImage, sans
+    réencodage JPEG/PNG. Le fichier temporaire ne sert plus que pour les modes
+    que Qt ne sait pas représenter. Le premier recours à un chemin plus lent
+    que l'enveloppe directe est signalé pour chaque mode d'image.
+    """
+    conversion = CONVERSION_DIRECT
+    if pil_image.mode not in _QIMAGE_FORMATS:
+        source_mode = pil_image.mode
+        try:
+            has_alpha = "A" in pil_image.getbands() or "transparency" in pil_image.info
+            pil_image = pil_image.convert("RGBA" if has_alpha else "RGB")
+            conversion = CONVERSION_CONVERTED
+        except Exception as e:
+            print(f"Erreur lors de la conversion de l'image: {e}")
+            _report_conversion(source_mode, CONVERSION_TEMP_FILE)
+            return _convert_with_temp_file(pil_image, quality), CONVERSION_TEMP_FILE
+        _report_conversion(source_mode, conversion)
+
+    qimage_format, bytes_per_pixel = _QIMAGE_FORMATS[pil_image.mode]
+    width, height = pil_image.size
+    data = pil_image.tobytes("raw", pil_image.mode)
+    wrapped = QImage(data, width, height, width * bytes_per_pixel, qimage_format)
+
+    # La conversion vers le format natif d'affichage copie les pixels dans un
+    # tampon appartenant à Qt : la QImage reste valide après la libération de `data`
+    # et QPixmap.fromImage n'a plus de conversion à faire.
+    if wrapped.hasAlphaChannel():
+        qimage = wrapped.convertToFormat(QImage.Format.Format_ARGB32_Premultiplied)
+    else:
+        qimage = wrapped.convertToFormat(QImage.Format.Format_RGB32)
+    return qimage, conversion
+
+def _report_conversion(mode, conversion):
+    if (mode, conversion) not in _reported_conversions:
+        _reported_conversions.add((mode, conversion))
+        print(f"Images en mode {mode} : chemin de conversion « {conversion} », plus lent que l'enveloppe directe")
+
+def _convert_with_temp_file(pil_image, quality=100):
+    """Conversion de secours passant par un fichier temporaire"""
+    temp_path = os.path.join(QStandardPaths.writableLocation(QStandardPaths.StandardLocation.TempLocation), "temp_heic.jpg")
+
+    # Utiliser PNG sur Windows pour une meilleure qualité
+    if sys.platform == "win32":
+        temp_path = os.path.join(QStandardPaths.writableLocation(QStandardPaths.StandardLocation.TempLocation), "temp_heic.png")
+        pil_image.save(temp_path, "PNG")
+    else:
         if pil_image.mode != "RGB":
             pil_image = pil_image.convert("RGB")
-        
-        buffer = io.BytesIO()
-        
-        # Sur Windows, utiliser PNG pour une meilleure qualité
-        if sys.platform == "win32":
-            pil_image.save(buffer, format="PNG")
-        else:
-            pil_image.save(buffer, format="JPEG", quality=quality, optimize=True, subsampling=0)
-            
-        buffer.seek(0)
-        qimage = QImage.fromData(buffer.getvalue())
-        return QPixmap.fromImage(qimage)
-        
-    except Exception as e:
-        print(f"Erreur lors de la conversion de l'image: {e}")
-        temp_path = os.path.join(QStandardPaths.writableLocation(QStandardPaths.StandardLocation.TempLocation), "temp_heic.jpg")
-        
-        # Utiliser PNG sur Windows pour une meilleure qualité
-        if sys.platform == "win32":
-            temp_path = os.path.join(QStandardPaths.writableLocation(QStandardPaths.StandardLocation.TempLocation), "temp_heic.png")
-            pil_image.save(temp_path, "PNG")
-        else:
-            pil_image.save(temp_path, "JPEG", quality=quality, optimize=True, subsampling=0)
-        
-        pixmap = QPixmap(temp_path)
-        try:
-            os.remove(temp_path)
-        except:
-            pass
-        
-        return pixmap
+        pil_image.save(temp_path, "JPEG", quality=quality, optimize=True, subsampling=0)
+
+    qimage = QImage(temp_path)
+    try:
+        os.remove(temp_path)
+    except:
+        pass
+
+    return qimage
+
+def decode_image(file_path, quality=100):
+    """Décode un fichier image en QImage (utilisable hors du thread principal)"""
+    with Image.open(file_path) as pil_image:
+        qimage, _ = convert_pil_to_qimage(pil_image, quality)
+    return qimage
+
+def decode_fitted(file_path, size, quality=100):
+    """Décode une version de l'image tenant dans un carré de `size` pixels.
+
+    Utilise la vignette intégrée ou le décodage réduit (JPEG) lorsqu'ils
+    suffisent, puis réduit l'image : l'affichage ajusté à la fenêtre ne garde
+    jamais en mémoire plus de pixels que l'écran n'en montre. La taille pleine
+    résolution est conservée dans la QImage (voir full_size_of). Une image déjà
+    plus petite que `size` est décodée entièrement.
+    """
+    with Image.open(file_path) as pil_image:
+        full_size = pil_image.size
+        pil_image = fit_pil_image(pil_image, size)
+        qimage, _ = convert_pil_to_qimage(pil_image, quality)
+    qimage.setText(FULL_SIZE_KEY, f"{full_size[0]}x{full_size[1]}")
+    return qimage
+
+def fit_pil_image(pil_image, size):
+    """Réduit une image PIL ouverte (pas encore chargée) pour tenir dans `size`"""
+    if pil_image.width <= size and pil_image.height <= size:
+        return pil_image
+    draft_for_size(pil_image, size)
+    # Réduction entière par blocs d'abord, Lanczos seulement sur le dernier facteur
+    pil_image.thumbnail((size, size), Image.Resampling.LANCZOS, reducing_gap=1.0)
+    return pil_image
+
+def full_size_of(qimage):
+    """Taille pleine résolution d'une image décodée, réduite ou non"""
+    full_size = qimage.text(FULL_SIZE_KEY)
+    if full_size:
+        width, height = full_size.split("x")
+        return QSize(int(width), int(height))
+    return qimage.size()
+
+def is_full_resolution(qimage):
+    return qimage.width() >= full_size_of(qimage).width()
+
+def decode_preview(file_path, size):
+    """Décode rapidement un aperçu de l'image pour un premier affichage.
+
+    Retourne (QImage, taille pleine résolution). L'aperçu est la vignette
+    intégrée (même plus petite que `size`) ou un décodage réduit ; il vaut None
+    lorsque le format n'offre aucun chemin plus rapide que le décodage complet.
+    """
+    with Image.open(file_path) as pil_image:
+        full_size = pil_image.size
+        if not draft_for_size(pil_image, size) and pil_image.draft(None, (1, 1)) is None:
+            return None, full_size
+        pil_image.thumbnail((size, size), Image.Resampling.BILINEAR)
+        qimage, _ = convert_pil_to_qimage(pil_image)
+    return qimage, full_size
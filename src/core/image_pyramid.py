@@ -0,0 +1,56 @@
+import math
+import threading
+from PyQt6.QtCore import Qt
+
+class ImagePyramid:
+    """Pyramide de résolutions (1, 1/2, 1/4, ...) d'une image décodée.
+
+    Les niveaux réduits sont construits en arrière-plan, chacun à partir du
+    précédent. Un zoom rééchantillonne depuis le plus petit niveau encore plus
+    grand que la taille voulue, ce qui rend son coût indépendant de la
+    résolution source.
+    """
+
+    def __init__(self, image, min_size=256):
+        self.image = image
+        self.min_size = min_size
+        self.levels = [image]
+        self._lock = threading.Lock()
+        self._cancelled = False
+        self._thread = None
+
+    def build_async(self):
+        """Lance la construction des niveaux réduits dans un thread"""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._build_levels, daemon=True)
+            self._thread.start()
+
+    def cancel(self):
+        self._cancelled = True
+
+    def level_for_scale(self, scale):
+        """Retourne (niveau, facteur du niveau) le plus proche au-dessus de `scale`"""
+        index = int(math.floor(math.log2(1.0 / scale))) if 0 < scale < 1 else 0
+        with self._lock:
+            index = min(index, len(self.levels) - 1)
+            return self.levels[index], 1.0 / (2 ** index)
+
+    def scaled(self, scale, transformation=Qt.TransformationMode.SmoothTransformation):
+        """Retourne l'image mise à l'échelle `scale` par rapport à la pleine résolution"""
+        width = max(1, int(self.image.width() * scale))
+        height = max(1, int(self.image.height() * scale))
+        level, _ = self.level_for_scale(scale)
+        if level.width() == width and level.height() == height:
+            return level
+        return level.scaled(width, height, Qt.AspectRatioMode.KeepAspectRatio, transformation)
+
+    def _build_levels(self):
+        level = self.image
+        while not self._cancelled and max(level.width(), level.height()) // 2 >= self.min_size:
+            level = level.scaled(
+                level.width() // 2, level.height() // 2,
+                Qt.AspectRatioMode.IgnoreAspectRatio,
+                Qt.TransformationMode.SmoothTransformation
+            )
+            with self._lock:
+                self.levels.append(level)
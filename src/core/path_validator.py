@@ -0,0 +1,99 @@
+import os
+import threading
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from PyQt6.QtCore import QObject, pyqtSignal
+
+class PathValidator(QObject):
+    """Vérifie en arrière-plan l'existence d'une liste de chemins.
+
+    Les chemins sont regroupés par dossier : chaque dossier n'est lu qu'une
+    fois (os.scandir) au lieu d'un appel à os.path.exists par fichier, et
+    plusieurs dossiers sont lus en parallèle. Les chemins introuvables sont
+    signalés par lots, au fur et à mesure.
+    """
+    paths_missing = pyqtSignal(list)
+    # nombre de chemins vérifiés, nombre de chemins introuvables
+    validation_finished = pyqtSignal(int, int)
+
+    def __init__(self, max_workers=8, batch_size=500, parent=None):
+        super().__init__(parent)
+        self.max_workers = max_workers
+        self.batch_size = batch_size
+        self._cancelled = threading.Event()
+        self._thread = None
+
+    def start(self, paths):
+        """Lance la vérification de `paths` dans un thread"""
+        self.cancel()
+        self._cancelled = threading.Event()
+        self._thread = threading.Thread(target=self._validate, args=(list(paths), self._cancelled))
+        self._thread.daemon = True
+        self._thread.start()
+
+    def cancel(self):
+        self._cancelled.set()
+
+    def _validate(self, paths, cancelled):
+        names_by_directory = defaultdict(set)
+        for path in paths:
+            directory, name = os.path.split(path)
+            names_by_directory[directory].add(name)
+
+        missing_total = 0
+        pending = []
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = [executor.submit(self._missing_in_directory, directory, names, cancelled)
+                       for directory, names in names_by_directory.items()]
+            for future in as_completed(futures):
+                if cancelled.is_set():
+                    executor.shutdown(wait=False, cancel_futures=True)
+                    return
+                pending.extend(future.result())
+                if len(pending) >= self.batch_size:
+                    missing_total += len(pending)
+                    self.paths_missing.emit(pending)
+                    pending = []
+        if pending:
+            missing_total += len(pending)
+            self.paths_missing.emit(pending)
+        self.validation_finished.emit(len(paths), missing_total)
+
+    @staticmethod
+    def _missing_in_directory(directory, names, cancelled):
+        if cancelled.is_set():
+            return []
+        try:
+            with os.scandir(directory or ".") as entries:
+                present = {entry.name for entry in entries}
+        except FileNotFoundError:
+            if _is_under_absent_mount(directory):
+                # Disque ou montage réseau débranché : les chemins restent non vérifiés
+                return []
+            present = set()
+        except OSError:
+            # Dossier inaccessible : ne rien retirer
+            return []
+        return [os.path.join(directory, name) for name in names if name not in present]
+
+
+def _is_under_absent_mount(directory):
+    """Indique si `directory`, introuvable, se trouvait sur un volume absent.
+
+    C'est le cas lorsque son plus proche ancêtre existant est un point de
+    montage (autre périphérique que son parent), ou un dossier vide : un point
+    de montage dont le volume est débranché apparaît comme un dossier vide.
+    """
+    ancestor = os.path.abspath(directory or ".")
+    while not os.path.exists(ancestor):
+        parent = os.path.dirname(ancestor)
+        if parent == ancestor:
+            return False
+        ancestor = parent
+    if os.path.ismount(ancestor):
+        return True
+    try:
+        with os.scandir(ancestor) as entries:
+            return next(entries, None) is None
+    except OSError:
+        return True
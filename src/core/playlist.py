@@ -0,0 +1,86 @@
+import bisect
+
+class Playlist:
+    """Liste ordonnée de chemins avec un index chemin -> position.
+
+    Les recherches de position et les tests d'appartenance se font en temps
+    constant ; l'index est mis à jour incrémentalement lors des ajouts et
+    suppressions. Les doublons sont ignorés.
+    """
+
+    def __init__(self, paths=()):
+        self._paths = []
+        self._positions = {}
+        self.extend(paths)
+
+    def __len__(self):
+        return len(self._paths)
+
+    def __iter__(self):
+        return iter(self._paths)
+
+    def __getitem__(self, index):
+        return self._paths[index]
+
+    def __contains__(self, path):
+        return path in self._positions
+
+    def __eq__(self, other):
+        if isinstance(other, Playlist):
+            return self._paths == other._paths
+        return self._paths == other
+
+    def __repr__(self):
+        return f"Playlist({len(self._paths)} images)"
+
+    def index(self, path):
+        """Position de `path`, ValueError s'il est absent (comme list.index)"""
+        try:
+            return self._positions[path]
+        except KeyError:
+            raise ValueError(f"{path} n'est pas dans la liste") from None
+
+    def append(self, path):
+        if path in self._positions:
+            return False
+        self._positions[path] = len(self._paths)
+        self._paths.append(path)
+        return True
+
+    def extend(self, paths):
+        for path in paths:
+            self.append(path)
+
+    def insert_sorted(self, path):
+        """Insère `path` à sa place dans une liste triée"""
+        if path in self._positions:
+            return False
+        position = bisect.bisect_left(self._paths, path)
+        self._paths.insert(position, path)
+        self._reindex(position)
+        return True
+
+    def remove(self, path):
+        position = self._positions.pop(path, None)
+        if position is None:
+            return False
+        del self._paths[position]
+        self._reindex(position)
+        return True
+
+    def remove_many(self, paths):
+        """Supprime plusieurs chemins en une seule réindexation"""
+        positions = [self._positions.pop(path) for path in set(paths) if path in self._positions]
+        if not positions:
+            return 0
+        for position in sorted(positions, reverse=True):
+            del self._paths[position]
+        self._reindex(min(positions))
+        return len(positions)
+
+    def to_list(self):
+        return list(self._paths)
+
+    def _reindex(self, start):
+        for position in range(start, len(self._paths)):
+            self._positions[self._paths[position]] = position
@@ -0,0 +1,114 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from src.core.image_processing import decode_fitted, decode_image, is_full_resolution
+
+class ImagePrefetcher:
+    """Décode en arrière-plan les images voisines de l'image affichée.
+
+    Les images décodées sont déposées dans le cache partagé ; la navigation
+    n'a ensuite plus qu'à les y récupérer. `variant` suit le mode d'affichage :
+    None pour la pleine résolution, sinon la taille de décodage réduite
+    (voir image_loader.fit_variant).
+    """
+
+    def __init__(self, image_cache, ahead=2, behind=1, max_workers=2):
+        self.image_cache = image_cache
+        self.ahead = ahead
+        self.behind = behind
+        self.variant = None
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="prefetch")
+        self._futures = {}
+        self._lock = threading.RLock()
+
+    def set_variant(self, variant):
+        """Change la variante préchargée ; les travaux de l'ancienne sont annulés"""
+        if variant != self.variant:
+            self.cancel()
+            self.variant = variant
+
+    def update(self, paths, index, direction=1):
+        """Planifie le préchargement autour de `index` dans la liste active.
+
+        Les `ahead` images situées dans le sens de la navigation passent en
+        premier, puis les `behind` images dans le sens opposé. Les travaux qui
+        ne concernent plus ce voisinage sont annulés.
+        """
+        if not paths or index < 0:
+            self.cancel()
+            return
+
+        count = len(paths)
+        forward = [(index + direction * step) % count for step in range(1, self.ahead + 1)]
+        backward = [(index - direction * step) % count for step in range(1, self.behind + 1)]
+        targets = []
+        for target_index in forward + backward:
+            path = paths[target_index]
+            if target_index != index and path not in targets:
+                targets.append(path)
+
+        with self._lock:
+            for path in list(self._futures):
+                if path not in targets:
+                    self._futures.pop(path).cancel()
+            # L'exécuteur traite les tâches dans l'ordre de soumission
+            for path in targets:
+                if path in self._futures or self._is_cached(path):
+                    continue
+                future = self._executor.submit(self._prefetch, path, self.variant)
+                future.add_done_callback(lambda done, path=path: self._forget(path, done))
+                self._futures[path] = future
+
+    def take(self, path):
+        """Récupère le résultat d'un préchargement en cours pour `path`.
+
+        Attend la fin du décodage s'il a déjà commencé ; une tâche encore en
+        file d'attente est annulée et None est retourné.
+        """
+        with self._lock:
+            future = self._futures.pop(path, None)
+        if future is None or future.cancel():
+            return None
+        return future.result()
+
+    def cancel(self):
+        """Annule tous les préchargements en attente"""
+        with self._lock:
+            futures = list(self._futures.values())
+            self._futures.clear()
+        for future in futures:
+            future.cancel()
+
+    def shutdown(self):
+        self.cancel()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _is_cached(self, path):
+        cache_key = self.image_cache.make_key(path)
+        if self.image_cache.contains(path, cache_key):
+            return True
+        return self.variant is not None and self.image_cache.contains(
+            path, self.image_cache.with_variant(cache_key, self.variant))
+
+    def _prefetch(self, path, variant):
+        with self._lock:
+            if path not in self._futures:
+                return None
+        try:
+            cache_key = self.image_cache.make_key(path)
+            if variant is None:
+                image = decode_image(path)
+            else:
+                image = decode_fitted(path, variant)
+                if not is_full_resolution(image):
+                    cache_key = self.image_cache.with_variant(cache_key, variant)
+            self.image_cache.put(path, image, cache_key)
+            return image
+        except Exception as e:
+            print(f"Erreur lors du préchargement de {path}: {e}")
+            return None
+
+    def _forget(self, path, future):
+        with self._lock:
+            if self._futures.get(path) is future:
+                del self._futures[path]
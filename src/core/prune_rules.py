@@ -0,0 +1,95 @@
+import fnmatch
+import os
+import stat
+import sys
+
+# Dossiers système jamais utiles à une recherche d'images
+if sys.platform == "win32":
+    DEFAULT_SYSTEM_EXCLUDES = (
+        "C:\\Windows", "C:\\$Recycle.Bin", "C:\\System Volume Information",
+        "C:\\ProgramData\\Package Cache",
+    )
+else:
+    DEFAULT_SYSTEM_EXCLUDES = (
+        "/proc", "/sys", "/dev", "/run", "/snap", "/lost+found",
+        "/var/cache", "/var/lib/docker", "/var/lib/containers", "/var/tmp",
+        "/private/var/vm", "/System/Volumes",
+    )
+
+# Motifs (noms de dossier) exclus par défaut : dépôts, dépendances et caches
+DEFAULT_PATTERNS = (
+    ".git", ".hg", ".svn", "node_modules", "__pycache__", ".venv",
+    ".cache", ".Trash*", ".tox", "site-packages",
+)
+
+# Raisons d'exclusion, dans l'ordre d'évaluation
+PRUNE_SYSTEM = "système"
+PRUNE_PATTERN = "motif"
+PRUNE_HIDDEN = "caché"
+PRUNE_DEPTH = "profondeur"
+PRUNE_FILESYSTEM = "autre système de fichiers"
+
+
+class PruneRules:
+    """Règles d'exclusion de sous-arbres lors d'un parcours.
+
+    Les règles sont évaluées sur chaque entrée de dossier au moment où elle
+    est lue : un sous-arbre exclu n'est jamais ouvert. Les motifs sont
+    comparés au nom du dossier, ou au chemin complet s'ils contiennent un
+    séparateur. `max_depth` compte les niveaux sous la racine (None : illimité).
+    """
+
+    def __init__(self, excluded_paths=DEFAULT_SYSTEM_EXCLUDES, patterns=DEFAULT_PATTERNS,
+                 one_filesystem=False, max_depth=None, skip_hidden=False):
+        self.excluded_paths = frozenset(os.path.normcase(os.path.normpath(path)) for path in excluded_paths)
+        self.patterns = tuple(patterns)
+        self.one_filesystem = one_filesystem
+        self.max_depth = max_depth
+        self.skip_hidden = skip_hidden
+        self._name_patterns = tuple(pattern for pattern in self.patterns if not _is_path_pattern(pattern))
+        self._path_patterns = tuple(pattern for pattern in self.patterns if _is_path_pattern(pattern))
+        self._root_device = None
+
+    def set_root(self, root_path):
+        """Mémorise le périphérique de la racine pour l'option `one_filesystem`"""
+        self._root_device = os.stat(root_path).st_dev if self.one_filesystem else None
+
+    def prune_reason(self, entry, depth):
+        """Raison d'exclure le dossier `entry` (os.DirEntry) situé à `depth`, ou None"""
+        if self.max_depth is not None and depth > self.max_depth:
+            return PRUNE_DEPTH
+        if self.excluded_paths and os.path.normcase(entry.path) in self.excluded_paths:
+            return PRUNE_SYSTEM
+        name = entry.name
+        if any(fnmatch.fnmatch(name, pattern) for pattern in self._name_patterns):
+            return PRUNE_PATTERN
+        if any(fnmatch.fnmatch(entry.path, pattern) for pattern in self._path_patterns):
+            return PRUNE_PATTERN
+        if self.skip_hidden and _is_hidden(entry):
+            return PRUNE_HIDDEN
+        if self._root_device is not None and os.lstat(entry.path).st_dev != self._root_device:
+            return PRUNE_FILESYSTEM
+        return None
+
+    def signature(self):
+        """Description stable des règles, pour associer un état de parcours à ses options"""
+        return "|".join((
+            ",".join(sorted(self.excluded_paths)),
+            ",".join(self.patterns),
+            str(int(self.one_filesystem)),
+            str(self.max_depth),
+            str(int(self.skip_hidden)),
+        ))
+
+
+def _is_path_pattern(pattern):
+    return "/" in pattern or os.sep in pattern
+
+
+def _is_hidden(entry):
+    if entry.name.startswith("."):
+        return True
+    if sys.platform == "win32":
+        attributes = getattr(entry.stat(follow_symlinks=False), "st_file_attributes", 0)
+        return bool(attributes & stat.FILE_ATTRIBUTE_HIDDEN)
+    return False
@@ -0,0 +1,206 @@
+import hashlib
+import os
+import tempfile
+import threading
+from pathlib import Path
+from PIL import Image
+from PIL.PngImagePlugin import PngInfo
+
+# Classes de taille des miniatures conservées ; une demande est servie par
+# la plus petite classe suffisante
+SIZE_CLASSES = (32, 150, 256)
+
+# Dossiers de la spécification freedesktop et leur taille maximale
+FREEDESKTOP_SIZES = (("normal", 128), ("large", 256))
+
+
+def size_class(size):
+    """Plus petite classe couvrant `size`, ou None au-delà de la plus grande"""
+    for size_class_value in SIZE_CLASSES:
+        if size <= size_class_value:
+            return size_class_value
+    return None
+
+
+def file_uri(file_path):
+    return Path(os.path.abspath(file_path)).as_uri()
+
+
+def freedesktop_directory():
+    """Dossier de miniatures partagé des gestionnaires de fichiers (XDG)"""
+    cache_home = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(cache_home, "thumbnails")
+
+
+class ThumbnailCache:
+    """Cache disque des miniatures, persistant entre les sessions.
+
+    L'organisation suit la spécification freedesktop : un PNG par image,
+    nommé d'après le MD5 de l'URI du fichier et portant les champs
+    Thumb::URI, Thumb::MTime et Thumb::Size. Une miniature n'est valide que
+    si la date et la taille du fichier n'ont pas changé. Les miniatures déjà
+    produites par les gestionnaires de fichiers (~/.cache/thumbnails) sont
+    réutilisées en lecture.
+
+    Les écritures sont atomiques (fichier temporaire puis renommage) et
+    peuvent venir de plusieurs threads ou processus. Au-delà de `max_bytes`,
+    les miniatures les moins récemment utilisées sont supprimées.
+
+    La taille occupée doit être suivie en un seul endroit : une instance
+    créée avec `manage_size=False` (processus de travail) n'évince jamais et
+    cumule ses écritures, à transmettre via take_written() à l'instance
+    propriétaire (add_written). Ce module n'importe pas Qt.
+    """
+
+    def __init__(self, directory, max_bytes=256 * 1024 * 1024, shared_directory=None, manage_size=True):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.shared_directory = shared_directory
+        self.manage_size = manage_size
+        self._lock = threading.Lock()
+        self._used_bytes = None
+        self._written_bytes = 0
+
+    def get(self, file_path, size):
+        """Miniature (image PIL) de `file_path` tenant dans `size`, ou None"""
+        try:
+            stat = os.stat(file_path)
+        except OSError:
+            return None
+        name = self._file_name(file_path)
+        cache_class = size_class(size)
+        candidates = []
+        if cache_class is not None:
+            candidates.append((os.path.join(self.directory, str(cache_class), name), True))
+        if self.shared_directory:
+            for folder, folder_size in FREEDESKTOP_SIZES:
+                if size <= folder_size:
+                    candidates.append((os.path.join(self.shared_directory, folder, name), False))
+
+        for thumbnail_path, owned in candidates:
+            image = self._read_valid(thumbnail_path, file_path, stat)
+            if image is None:
+                continue
+            if owned:
+                self._touch(thumbnail_path)
+            if image.width > size or image.height > size:
+                image.thumbnail((size, size), Image.Resampling.LANCZOS)
+            return image
+        return None
+
+    def put(self, file_path, pil_image, size):
+        """Enregistre la miniature de `file_path` dans la classe de `size`"""
+        cache_class = size_class(size)
+        if cache_class is None:
+            return False
+        try:
+            stat = os.stat(file_path)
+            class_directory = os.path.join(self.directory, str(cache_class))
+            os.makedirs(class_directory, exist_ok=True)
+            if pil_image.mode not in ("RGB", "RGBA"):
+                pil_image = pil_image.convert("RGBA" if "A" in pil_image.getbands() else "RGB")
+            info = PngInfo()
+            info.add_text("Thumb::URI", file_uri(file_path))
+            info.add_text("Thumb::MTime", str(int(stat.st_mtime)))
+            info.add_text("Thumb::Size", str(stat.st_size))
+            info.add_text("Software", "HeicViewer")
+
+            fd, temp_path = tempfile.mkstemp(dir=class_directory, prefix=".tmp-", suffix=".png")
+            try:
+                with os.fdopen(fd, 'wb') as f:
+                    pil_image.save(f, "PNG", pnginfo=info)
+                thumbnail_path = os.path.join(class_directory, self._file_name(file_path))
+                previous_size = os.path.getsize(thumbnail_path) if os.path.exists(thumbnail_path) else 0
+                os.replace(temp_path, thumbnail_path)
+            except BaseException:
+                try:
+                    os.remove(temp_path)
+                except OSError:
+                    pass
+                raise
+            delta = os.path.getsize(thumbnail_path) - previous_size
+            if self.manage_size:
+                self.add_written(delta)
+            else:
+                with self._lock:
+                    self._written_bytes += delta
+            return True
+        except Exception as e:
+            print(f"Erreur lors de l'écriture de la miniature de {file_path}: {e}")
+            return False
+
+    @staticmethod
+    def _file_name(file_path):
+        return hashlib.md5(file_uri(file_path).encode("utf-8")).hexdigest() + ".png"
+
+    @staticmethod
+    def _read_valid(thumbnail_path, file_path, stat):
+        try:
+            with Image.open(thumbnail_path) as image:
+                image.load()
+                text = getattr(image, "text", {})
+                if text.get("Thumb::URI") != file_uri(file_path):
+                    return None
+                if text.get("Thumb::MTime") != str(int(stat.st_mtime)):
+                    return None
+                if "Thumb::Size" in text and text["Thumb::Size"] != str(stat.st_size):
+                    return None
+                return image.copy()
+        except (OSError, ValueError, SyntaxError):
+            return None
+
+    @staticmethod
+    def _touch(thumbnail_path):
+        # La date de modification sert d'horodatage d'utilisation pour l'éviction
+        try:
+            os.utime(thumbnail_path)
+        except OSError:
+            pass
+
+    def take_written(self):
+        """Octets écrits depuis le dernier appel (instance sans gestion de taille)"""
+        with self._lock:
+            written, self._written_bytes = self._written_bytes, 0
+        return written
+
+    def add_written(self, delta):
+        """Prend en compte `delta` octets écrits et évince au-delà du budget"""
+        with self._lock:
+            if self._used_bytes is None:
+                self._used_bytes = self._measure()
+            else:
+                self._used_bytes += delta
+            if self._used_bytes <= self.max_bytes:
+                return
+            self._used_bytes = self._evict(int(self.max_bytes * 0.9))
+
+    def _entries(self):
+        for cache_class in SIZE_CLASSES:
+            class_directory = os.path.join(self.directory, str(cache_class))
+            try:
+                with os.scandir(class_directory) as entries:
+                    for entry in entries:
+                        if entry.name.endswith(".png") and not entry.name.startswith(".tmp-"):
+                            try:
+                                yield entry.path, entry.stat()
+                            except OSError:
+                                continue
+            except OSError:
+                continue
+
+    def _measure(self):
+        return sum(stat.st_size for _, stat in self._entries())
+
+    def _evict(self, target_bytes):
+        """Supprime les miniatures les plus anciennement utilisées ; retourne la taille restante"""
+        entries = sorted(self._entries(), key=lambda entry: entry[1].st_mtime)
+        used = sum(stat.st_size for _, stat in entries)
+        for path, stat in entries:
+            if used <= target_bytes:
+                break
+            try:
+                os.remove(path)
+                used -= stat.st_size
+            except OSError:
+                continue
+        return used
@@ -0,0 +1,154 @@
+import heapq
+import itertools
+import os
+import sys
+import threading
+from PyQt6.QtCore import QObject, QTimer, QStandardPaths, pyqtSignal
+from PyQt6.QtGui import QImage
+
+from src.core.image_processing import convert_pil_to_qimage
+from src.core.thumbnail_cache import ThumbnailCache, freedesktop_directory
+from src.core.thumbnail_service import ThumbnailService
+
+# Priorités des demandes de miniatures
+PRIORITY_VISIBLE = 0
+PRIORITY_NEARBY = 1
+
+_thumbnail_cache = None
+_thumbnail_service = None
+
+
+def get_thumbnail_cache():
+    """Cache disque des miniatures partagé par toute l'application"""
+    global _thumbnail_cache
+    if _thumbnail_cache is None:
+        app_data_path = QStandardPaths.writableLocation(QStandardPaths.StandardLocation.AppDataLocation)
+        shared_directory = None if sys.platform == "win32" else freedesktop_directory()
+        _thumbnail_cache = ThumbnailCache(os.path.join(app_data_path, "HeicViewer", "thumbnails"),
+                                          shared_directory=shared_directory)
+    return _thumbnail_cache
+
+
+def get_thumbnail_service():
+    """Groupe de processus de miniatures partagé par la galerie et la recherche"""
+    global _thumbnail_service
+    if _thumbnail_service is None:
+        _thumbnail_service = ThumbnailService(cache=get_thumbnail_cache())
+    return _thumbnail_service
+
+
+class ThumbnailLoader(QObject):
+    """Planifie le chargement des miniatures d'une vue.
+
+    La file est une file de priorité : les éléments visibles passent avant
+    leurs voisins, et chaque appel à `request` remplace les demandes non
+    commencées, si bien que les lignes sorties de l'écran sont abandonnées.
+    Les miniatures (QImage) sont transmises par lots via `thumbnails_ready`.
+    Elles sont lues dans le cache disque lorsqu'il en a une copie valide ;
+    sinon elles sont générées par le ThumbnailService partagé. Chaque thread
+    de la vue attend un résultat à la fois : le nombre de threads borne les
+    demandes transmises aux processus.
+    """
+    # [(chemin, QImage)] ; une QImage nulle signale un échec de décodage
+    thumbnails_ready = pyqtSignal(list)
+    _results_pending = pyqtSignal()
+
+    def __init__(self, size, max_workers=None, batch_interval=50, cache=None, service=None, parent=None):
+        super().__init__(parent)
+        self.size = size
+        self.cache = cache or get_thumbnail_cache()
+        self.service = service or get_thumbnail_service()
+        self.batch_interval = batch_interval
+        self._condition = threading.Condition()
+        self._queue = []
+        self._sequence = itertools.count()
+        self._in_flight = set()
+        self._finished = set()
+        self._results = []
+        self._generation = 0
+        self._stopped = False
+        self._results_pending.connect(self._schedule_delivery)
+
+        max_workers = max_workers or self.service.max_workers
+        for index in range(max_workers):
+            thread = threading.Thread(target=self._work, name=f"thumbnail-{index}", daemon=True)
+            thread.start()
+
+    def request(self, visible_paths, nearby_paths=()):
+        """Remplace la file : les chemins visibles d'abord, puis leurs voisins"""
+        with self._condition:
+            self._queue = []
+            for priority, paths in ((PRIORITY_VISIBLE, visible_paths), (PRIORITY_NEARBY, nearby_paths)):
+                for path in paths:
+                    if path not in self._finished and path not in self._in_flight:
+                        self._queue.append((priority, next(self._sequence), path))
+            heapq.heapify(self._queue)
+            self._condition.notify_all()
+
+    def is_finished(self, path):
+        with self._condition:
+            return path in self._finished
+
+    def forget(self, paths):
+        """Permet de redemander des miniatures dont l'appelant ne garde plus l'image"""
+        with self._condition:
+            self._finished.difference_update(paths)
+
+    def clear(self):
+        """Oublie les demandes et les miniatures déjà chargées"""
+        with self._condition:
+            self._generation += 1
+            self._queue = []
+            self._finished.clear()
+            self._results = []
+
+    def shutdown(self):
+        with self._condition:
+            self._stopped = True
+            self._queue = []
+            self._condition.notify_all()
+
+    def _work(self):
+        while True:
+            with self._condition:
+                while not self._queue and not self._stopped:
+                    self._condition.wait()
+                if self._stopped:
+                    return
+                _, _, path = heapq.heappop(self._queue)
+                if path in self._in_flight or path in self._finished:
+                    continue
+                self._in_flight.add(path)
+                generation = self._generation
+
+            try:
+                image = self._load(path)
+            except Exception:
+                image = QImage()
+
+            with self._condition:
+                self._in_flight.discard(path)
+                if generation != self._generation:
+                    continue
+                self._finished.add(path)
+                self._results.append((path, image))
+                first_result = len(self._results) == 1
+            if first_result:
+                self._results_pending.emit()
+
+    def _load(self, path):
+        pil_image = self.cache.get(path, self.size)
+        if pil_image is None:
+            pil_image = self.service.render(path, self.size)
+        qimage, _ = convert_pil_to_qimage(pil_image)
+        return qimage
+
+    def _schedule_delivery(self):
+        # Les résultats qui arrivent pendant l'intervalle rejoignent le même lot
+        QTimer.singleShot(self.batch_interval, self._deliver)
+
+    def _deliver(self):
+        with self._condition:
+            results, self._results = self._results, []
+        if results:
+            self.thumbnails_ready.emit(results)
@@ -0,0 +1,92 @@
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+from src.core.heif_codec import from_buffer, render_thumbnail, to_buffer
+from src.core.thumbnail_cache import ThumbnailCache
+
+# Cache disque propre à chaque processus de travail
+_worker_cache = None
+
+
+def _init_worker(cache_settings):
+    global _worker_cache
+    if cache_settings is not None:
+        directory, shared_directory, max_bytes = cache_settings
+        # La taille du cache est suivie par le processus principal : chaque
+        # processus n'en voit que ses propres écritures
+        _worker_cache = ThumbnailCache(directory, max_bytes, shared_directory, manage_size=False)
+
+
+def _render_in_worker(file_path, size):
+    buffer = to_buffer(render_thumbnail(file_path, size, _worker_cache))
+    return buffer, _worker_cache.take_written() if _worker_cache is not None else 0
+
+
+class ThumbnailService:
+    """Génération de miniatures dans un groupe de processus.
+
+    Le décodage HEIC et la réduction occupent le processeur en tenant le GIL :
+    des processus séparés permettent d'utiliser tous les cœurs. Les processus
+    n'importent pas Qt (voir heif_codec) ; ils renvoient les pixels bruts de la
+    miniature et enregistrent eux-mêmes le résultat dans le cache disque.
+    La taille de ce cache et l'éviction restent gérées ici, à partir des
+    octets écrits que chaque processus rapporte.
+    Le groupe est démarré à la première demande.
+    """
+
+    def __init__(self, max_workers=None, cache=None):
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.cache = cache
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def set_max_workers(self, max_workers):
+        """Change le nombre de processus ; le groupe est recréé à la demande suivante"""
+        with self._lock:
+            self.max_workers = max(1, max_workers)
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False)
+
+    def submit(self, file_path, size):
+        """Planifie une miniature ; le résultat du Future est (tampon, octets écrits
+        dans le cache), voir to_buffer"""
+        future = self._get_executor().submit(_render_in_worker, file_path, size)
+        if self.cache is not None:
+            future.add_done_callback(self._account_written)
+        return future
+
+    def render(self, file_path, size):
+        """Miniature PIL de `file_path`, générée dans un processus de travail"""
+        buffer, _ = self.submit(file_path, size).result()
+        return from_buffer(buffer)
+
+    def _account_written(self, future):
+        if future.cancelled() or future.exception() is not None:
+            return
+        written = future.result()[1]
+        if written:
+            self.cache.add_written(written)
+
+    def shutdown(self, wait=False):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait, cancel_futures=True)
+
+    def _get_executor(self):
+        with self._lock:
+            if self._executor is None:
+                cache_settings = None
+                if self.cache is not None:
+                    cache_settings = (self.cache.directory, self.cache.shared_directory, self.cache.max_bytes)
+                # "spawn" : les processus ne partagent rien de l'état Qt du programme principal
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_init_worker,
+                    initargs=(cache_settings,)
+                )
+            return self._executor
@@ -0,0 +1,98 @@
+import atexit
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+
+class WriteBehindQueue:
+    """File d'écritures différées, exécutées par un thread d'arrière-plan.
+
+    Les écritures planifiées sous une même clé pendant la fenêtre de
+    regroupement (`delay`) sont fusionnées en une seule. Tout ce qui reste en
+    attente est écrit à la sortie du programme. Une valeur reste visible par
+    `pending_value` jusqu'à la fin de son écriture.
+    """
+
+    def __init__(self, delay=0.5):
+        self.delay = delay
+        self._pending = OrderedDict()
+        # Valeurs retirées de la file dont l'écriture n'est pas terminée
+        self._writing = {}
+        self._condition = threading.Condition()
+        self._write_lock = threading.Lock()
+        self._thread = None
+        atexit.register(self.flush)
+
+    def schedule(self, key, write, value, merge=None):
+        """Planifie `write(value)`.
+
+        Si une écriture est déjà en attente sous `key`, les valeurs sont
+        fusionnées avec `merge(ancienne, nouvelle)` ou la nouvelle remplace
+        l'ancienne.
+        """
+        with self._condition:
+            if key in self._pending and merge is not None:
+                value = merge(self._pending[key][1], value)
+            self._pending[key] = (write, value)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, daemon=True)
+                self._thread.start()
+            self._condition.notify()
+
+    def pending_value(self, key):
+        """Valeur en attente d'écriture sous `key`, ou None"""
+        with self._condition:
+            entry = self._pending.get(key) or self._writing.get(key)
+            return entry[1] if entry else None
+
+    def flush(self):
+        """Écrit immédiatement tout ce qui est en attente"""
+        with self._write_lock:
+            with self._condition:
+                pending, self._pending = self._pending, OrderedDict()
+                self._writing = dict(pending)
+            for key, (write, value) in pending.items():
+                try:
+                    write(value)
+                except Exception as e:
+                    print(f"Erreur lors de l'écriture différée: {e}")
+                finally:
+                    with self._condition:
+                        del self._writing[key]
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while not self._pending:
+                    self._condition.wait()
+            # Laisser arriver les modifications suivantes avant d'écrire
+            time.sleep(self.delay)
+            self.flush()
+
+def write_json_atomic(file_path, data):
+    """Écrit un fichier JSON de façon atomique (fichier temporaire puis renommage)"""
+    directory = os.path.dirname(file_path)
+    fd, temp_path = tempfile.mkstemp(dir=directory, prefix=".tmp-", suffix=".json")
+    try:
+        with os.fdopen(fd, 'w') as f:
+            json.dump(data, f)
+        os.replace(temp_path, file_path)
+    except BaseException:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+        raise
+
+_write_queue = None
+_write_queue_lock = threading.Lock()
+
+def get_write_queue():
+    """File d'écritures partagée par tous les gestionnaires de données"""
+    global _write_queue
+    with _write_queue_lock:
+        if _write_queue is None:
+            _write_queue = WriteBehindQueue()
+        return _write_queue
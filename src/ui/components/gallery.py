@@ -1,12 +1,11 @@
 import os
 from PyQt6.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QPushButton,
-                            QScrollArea, QLabel, QGridLayout, QCheckBox,
-                            QMessageBox, QFrame)
-from PyQt6.QtCore import Qt, QSize, QTimer
-from PyQt6.QtGui import QIcon
+                            QListView, QLabel, QCheckBox, QFrame)
+from PyQt6.QtCore import Qt, QTimer
 
-from src.core.image_processing import load_image
 from src.core.data_manager import HeicDataManager
+from src.core.thumbnail_loader import ThumbnailLoader
+from src.ui.components.gallery_model import GalleryModel, GalleryDelegate
 
 class ImageGalleryDialog(QDialog):
     """Dialogue affichant une galerie de toutes les images disponibles"""
@@ -22,6 +21,14 @@ class ImageGalleryDialog(QDialog):
         self.thumbnail_size = 150
         self.data_manager = HeicDataManager()
         
+        # Miniatures chargées hors du thread principal, pour les cellules visibles
+        self.thumbnail_loader = ThumbnailLoader(self.thumbnail_size - 10, parent=self)
+        self.wanted_thumbnails = []
+        self.request_timer = QTimer(self)
+        self.request_timer.setSingleShot(True)
+        self.request_timer.setInterval(30)
+        self.request_timer.timeout.connect(self.request_thumbnails)
+        
         # Mettre à jour le titre avec le nombre d'images
         self.setWindowTitle(f"Galerie d'images - {len(image_files)} images")
         
@@ -61,13 +68,10 @@ class ImageGalleryDialog(QDialog):
             QPushButton:pressed {
                 background-color: #252525;
             }
-            QScrollArea {
+            QListView {
                 background-color: #232323;
                 border: 1px solid #363636;
             }
-            QScrollArea > QWidget > QWidget {
-                background-color: #232323;
-            }
             QScrollBar {
                 background-color: #2A2A2A;
                 width: 12px;
@@ -116,28 +120,27 @@ class ImageGalleryDialog(QDialog):
         info_layout.addWidget(info_label)
         layout.addWidget(info_frame)
         
-        # Création de la grille pour les miniatures
-        self.grid_layout = QGridLayout()
-        
-        # Nombre de colonnes en fonction de la largeur
-        num_columns = max(3, self.width() // (self.thumbnail_size + 10))
-        
-        # Chargement des miniatures
-        for i, image_path in enumerate(self.image_files):
-            item = self.create_thumbnail_widget(image_path, i)
-            row = i // num_columns
-            col = i % num_columns
-            self.grid_layout.addWidget(item, row, col)
-        
-        # Conteneur pour la grille avec défilement
-        container = QLabel()
-        container.setLayout(self.grid_layout)
-        
-        scroll_area = QScrollArea()
-        scroll_area.setWidget(container)
-        scroll_area.setWidgetResizable(True)
-        
-        layout.addWidget(scroll_area)
+        # Vue virtualisée : seules les cellules visibles sont dessinées
+        self.model = GalleryModel(self.image_files, self.current_index, self)
+        self.model.thumbnail_wanted.connect(self.on_thumbnail_wanted)
+        self.model.thumbnails_evicted.connect(self.thumbnail_loader.forget)
+        self.thumbnail_loader.thumbnails_ready.connect(self.model.set_thumbnails)
+        
+        self.list_view = QListView()
+        self.list_view.setViewMode(QListView.ViewMode.IconMode)
+        self.list_view.setResizeMode(QListView.ResizeMode.Adjust)
+        self.list_view.setMovement(QListView.Movement.Static)
+        self.list_view.setUniformItemSizes(True)
+        self.list_view.setSpacing(5)
+        self.list_view.setMouseTracking(True)
+        self.list_view.setItemDelegate(GalleryDelegate(self.thumbnail_size, self.list_view))
+        self.list_view.setModel(self.model)
+        self.list_view.clicked.connect(self.on_item_clicked)
+        self.list_view.activated.connect(self.on_item_clicked)
+        # Un défilement commence une nouvelle série de cellules visibles
+        self.list_view.verticalScrollBar().valueChanged.connect(lambda: self.wanted_thumbnails.clear())
+        
+        layout.addWidget(self.list_view)
         
         # Boutons de navigation
         button_layout = QHBoxLayout()
@@ -161,114 +164,23 @@ class ImageGalleryDialog(QDialog):
         
     def scroll_to_current(self):
         """Fait défiler la vue jusqu'à l'image courante"""
-        if self.current_index >= 0 and hasattr(self, 'container'):
-            # La logique pour faire défiler jusqu'à l'élément actuel
-            pass
-        
-    def create_thumbnail_widget(self, image_path, index):
-        """Crée un widget miniature pour une image"""
-        # Créer un conteneur pour la miniature et son numéro
-        frame = QFrame()
-        frame_layout = QVBoxLayout(frame)
-        frame_layout.setContentsMargins(3, 3, 3, 3)
-        frame_layout.setSpacing(2)
-        
-        # Définir le style de base du cadre
-        frame.setFrameShape(QFrame.Shape.StyledPanel)
-        frame.setFrameShadow(QFrame.Shadow.Raised)
-        frame.setLineWidth(1)
-        
-        # Ajouter un label pour le numéro
-        num_label = QLabel(f"{index + 1}")
-        num_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        
-        # Créer le bouton pour l'image
-        button = QPushButton()
-        button.setToolTip(f"{index + 1} - {os.path.basename(image_path)}")
-        button.setFixedSize(self.thumbnail_size, self.thumbnail_size)
-        button.setFlat(True)  # Bouton plat pour un meilleur rendu visuel
-        
-        # Chargement et redimensionnement de la miniature
-        try:
-            _, pixmap = load_image(image_path, 70)  # Qualité réduite pour les miniatures
-            pixmap = pixmap.scaled(
-                QSize(self.thumbnail_size - 10, self.thumbnail_size - 10),
-                Qt.AspectRatioMode.KeepAspectRatio,
-                Qt.TransformationMode.SmoothTransformation
-            )
-            button.setIcon(QIcon(pixmap))
-            button.setIconSize(QSize(self.thumbnail_size - 12, self.thumbnail_size - 12))
-            
-            # Appliquer un style différent si c'est l'image courante
-            if index == self.current_index:
-                # Style pour l'image sélectionnée - conserve le gris sombre avec accent bleu
-                frame.setStyleSheet("""
-                    QFrame {
-                        background-color: #383840;
-                        border: 2px solid #6080B0;
-                        border-radius: 6px;
-                    }
-                """)
-                num_label.setStyleSheet("""
-                    QLabel {
-                        font-weight: bold;
-                        color: #90A0D0;
-                        font-size: 10pt;
-                        background-color: #383840;
-                    }
-                """)
-                button.setStyleSheet("""
-                    QPushButton {
-                        background-color: #383840;
-                        border: 1px solid #505060;
-                        border-radius: 4px;
-                    }
-                    QPushButton:hover {
-                        background-color: #404050;
-                    }
-                """)
-            else:
-                # Style normal - gris sombre
-                frame.setStyleSheet("""
-                    QFrame {
-                        background-color: #404040;
-                        border: 1px solid #505050;
-                        border-radius: 4px;
-                    }
-                    QFrame:hover {
-                        border: 1px solid #606060;
-                        background-color: #454545;
-                    }
-                """)
-                num_label.setStyleSheet("""
-                    QLabel {
-                        font-weight: bold;
-                        color: #B0B0B0;
-                        font-size: 9pt;
-                        background-color: #404040;
-                    }
-                """)
-                button.setStyleSheet("""
-                    QPushButton {
-                        background-color: transparent;
-                        border: 1px solid #505050;
-                        border-radius: 2px;
-                    }
-                    QPushButton:hover {
-                        background-color: #505050;
-                        border: 1px solid #606060;
-                    }
-                """)
-                
-        except Exception as e:
-            button.setText(os.path.basename(image_path))
-        
-        button.clicked.connect(lambda: self.select_image(image_path))
-        
-        frame_layout.addWidget(num_label)
-        frame_layout.addWidget(button)
-        
-        return frame
+        if 0 <= self.current_index < self.model.rowCount():
+            index = self.model.index(self.current_index)
+            self.list_view.setCurrentIndex(index)
+            self.list_view.scrollTo(index, QListView.ScrollHint.PositionAtCenter)
+    
+    def on_thumbnail_wanted(self, image_path):
+        """Appelé par le délégué pour chaque cellule peinte sans miniature"""
+        if image_path not in self.wanted_thumbnails:
+            self.wanted_thumbnails.append(image_path)
+        self.request_timer.start()
+    
+    def request_thumbnails(self):
+        # Les demandes des cellules sorties de l'écran sont abandonnées
+        self.thumbnail_loader.request(list(self.wanted_thumbnails))
+    
+    def on_item_clicked(self, index):
+        self.select_image(index.data(Qt.ItemDataRole.UserRole))
     
     def select_image(self, image_path):
         """Sélectionne une image et ferme le dialogue"""
@@ -281,3 +193,7 @@ class ImageGalleryDialog(QDialog):
             # Sauvegarder les images pour une utilisation future sans afficher de notification
             success = self.data_manager.add_search_result(self.image_files)
         self.reject()
+    
+    def done(self, result):
+        self.thumbnail_loader.shutdown()
+        super().done(result)
@@ -0,0 +1,140 @@
+import os
+from collections import OrderedDict
+from PyQt6.QtWidgets import QStyledItemDelegate, QStyle
+from PyQt6.QtCore import Qt, QAbstractListModel, QModelIndex, QRectF, QSize, pyqtSignal
+from PyQt6.QtGui import QColor, QFont, QPen, QPixmap
+
+
+class GalleryModel(QAbstractListModel):
+    """Modèle de la galerie : une ligne par image de la liste affichée.
+
+    La liste n'est pas copiée et aucune miniature n'est chargée d'avance :
+    le délégué signale les cellules peintes sans miniature (`thumbnail_wanted`)
+    et seules les dernières miniatures reçues sont gardées en mémoire.
+    """
+    thumbnail_wanted = pyqtSignal(str)
+    # Miniatures retirées du cache, à redemander si elles redeviennent visibles
+    thumbnails_evicted = pyqtSignal(list)
+
+    # Nombre de miniatures conservées (environ 80 Ko chacune en 150 px)
+    MAX_THUMBNAILS = 1000
+
+    def __init__(self, image_files, current_index=-1, parent=None):
+        super().__init__(parent)
+        self.image_files = image_files
+        self.current_index = current_index
+        self._thumbnails = OrderedDict()
+        self._failed = set()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.image_files)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        path = self.image_files[index.row()]
+        if role == Qt.ItemDataRole.DisplayRole:
+            return f"{index.row() + 1}"
+        if role == Qt.ItemDataRole.ToolTipRole:
+            return f"{index.row() + 1} - {os.path.basename(path)}"
+        if role == Qt.ItemDataRole.UserRole:
+            return path
+        return None
+
+    def thumbnail(self, path):
+        """Miniature de `path` ; None si elle n'est pas (ou plus) en mémoire"""
+        pixmap = self._thumbnails.get(path)
+        if pixmap is not None:
+            self._thumbnails.move_to_end(path)
+        return pixmap
+
+    def is_failed(self, path):
+        return path in self._failed
+
+    def request_thumbnail(self, path):
+        self.thumbnail_wanted.emit(path)
+
+    def set_thumbnails(self, thumbnails):
+        """Applique un lot de miniatures [(chemin, QImage)]"""
+        for path, image in thumbnails:
+            if image.isNull():
+                self._failed.add(path)
+            else:
+                self._thumbnails[path] = QPixmap.fromImage(image)
+                self._thumbnails.move_to_end(path)
+        evicted = []
+        while len(self._thumbnails) > self.MAX_THUMBNAILS:
+            path, _ = self._thumbnails.popitem(last=False)
+            evicted.append(path)
+        if evicted:
+            self.thumbnails_evicted.emit(evicted)
+        if self.image_files:
+            # La vue ne repeint que les cellules visibles
+            self.dataChanged.emit(self.index(0), self.index(len(self.image_files) - 1),
+                                  [Qt.ItemDataRole.DecorationRole])
+
+
+class GalleryDelegate(QStyledItemDelegate):
+    """Dessine une cellule de la galerie : numéro, cadre et miniature.
+
+    Remplace les QFrame/QLabel/QPushButton créés pour chaque image : seules
+    les cellules visibles sont peintes, et c'est à ce moment que la
+    miniature manquante est demandée.
+    """
+
+    def __init__(self, thumbnail_size, parent=None):
+        super().__init__(parent)
+        self.thumbnail_size = thumbnail_size
+        self.label_height = 18
+        self.margin = 3
+
+    def sizeHint(self, option, index):
+        return QSize(self.thumbnail_size + 2 * self.margin,
+                     self.thumbnail_size + self.label_height + 2 * self.margin)
+
+    def paint(self, painter, option, index):
+        model = index.model()
+        path = index.data(Qt.ItemDataRole.UserRole)
+        is_current = index.row() == model.current_index
+        hovered = bool(option.state & QStyle.StateFlag.State_MouseOver)
+        rect = QRectF(option.rect).adjusted(1, 1, -1, -1)
+
+        painter.save()
+        painter.setRenderHint(painter.RenderHint.Antialiasing)
+        # Cadre : accent bleu pour l'image courante, gris sombre sinon
+        if is_current:
+            painter.setPen(QPen(QColor("#6080B0"), 2))
+            painter.setBrush(QColor("#383840"))
+            painter.drawRoundedRect(rect, 6, 6)
+        else:
+            painter.setPen(QPen(QColor("#606060" if hovered else "#505050"), 1))
+            painter.setBrush(QColor("#454545" if hovered else "#404040"))
+            painter.drawRoundedRect(rect, 4, 4)
+
+        # Numéro de l'image
+        font = QFont(option.font)
+        font.setBold(True)
+        font.setPointSize(10 if is_current else 9)
+        painter.setFont(font)
+        painter.setPen(QColor("#90A0D0" if is_current else "#B0B0B0"))
+        label_rect = QRectF(rect.x(), rect.y() + self.margin, rect.width(), self.label_height)
+        painter.drawText(label_rect, Qt.AlignmentFlag.AlignCenter, index.data())
+
+        # Miniature centrée, ou nom du fichier tant qu'elle n'est pas disponible
+        image_rect = QRectF(rect.x() + self.margin, label_rect.bottom(),
+                            rect.width() - 2 * self.margin, rect.bottom() - label_rect.bottom() - self.margin)
+        pixmap = model.thumbnail(path)
+        if pixmap is not None:
+            size = pixmap.size().scaled(image_rect.size().toSize(), Qt.AspectRatioMode.KeepAspectRatio)
+            target = QRectF(0, 0, size.width(), size.height())
+            target.moveCenter(image_rect.center())
+            painter.drawPixmap(target, pixmap, QRectF(pixmap.rect()))
+        else:
+            if not model.is_failed(path):
+                model.request_thumbnail(path)
+            painter.setFont(option.font)
+            painter.setPen(QColor("#808080"))
+            name = painter.fontMetrics().elidedText(os.path.basename(path), Qt.TextElideMode.ElideMiddle,
+                                                    int(image_rect.width()))
+            painter.drawText(image_rect, Qt.AlignmentFlag.AlignCenter, name)
+        painter.restore()
@@ -1,41 +1,25 @@
 import os
 import sys
 import threading
-import time
 from PyQt6.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QPushButton, QLabel,
-                           QTreeWidget, QTreeWidgetItem, QProgressBar, QFileDialog,
-                           QMessageBox, QComboBox, QLineEdit, QCheckBox, QFrame)
-from PyQt6.QtCore import Qt, QStandardPaths, pyqtSignal, QSize, QTimer
+                           QTreeView, QAbstractItemView, QProgressBar, QFileDialog,
+                           QMessageBox, QComboBox, QLineEdit, QCheckBox, QFrame, QSpinBox)
+from PyQt6.QtCore import Qt, QStandardPaths, pyqtSignal, QSize, QTimer, QPoint
 from PyQt6.QtGui import QIcon, QPixmap
 
-from src.core.image_processing import load_image
 from src.core.data_manager import HeicDataManager
-
-
-class SearchResultItem(QTreeWidgetItem):
-    def __init__(self, path, parent=None):
-        super().__init__(parent)
-        self.file_path = path
-        self.file_name = os.path.basename(path)
-        self.file_size = os.path.getsize(path) / 1024  # Ko
-        self.file_date = time.strftime('%d/%m/%Y %H:%M', 
-                                       time.localtime(os.path.getmtime(path)))
-        
-        # Définition des colonnes pour l'affichage
-        self.setText(0, self.file_name)
-        self.setText(1, f"{self.file_size:.1f} Ko")
-        self.setText(2, self.file_date)
-        self.setText(3, os.path.dirname(path))
-        
-        # Charger une miniature en arrière-plan
-        self.thumbnail_loaded = False
+from src.core.heic_scanner import HeicScanner, ParallelHeicScanner
+from src.core.prune_rules import PruneRules, DEFAULT_PATTERNS, DEFAULT_SYSTEM_EXCLUDES
+from src.core.thumbnail_loader import ThumbnailLoader
+from src.ui.components.search_result_model import SearchResultModel, make_search_result
 
 
 class HeicFinderDialog(QDialog):
     # Signaux pour la communication entre threads
     update_progress = pyqtSignal(int, str)
     search_completed = pyqtSignal(int)
-    add_search_result = pyqtSignal(str)
+    # Les résultats sont transmis par lots, au rythme de la progression
+    add_search_results = pyqtSignal(list)
     
     def __init__(self, parent=None):
         super().__init__(parent)
@@ -45,9 +29,23 @@ class HeicFinderDialog(QDialog):
         
         self.parent_viewer = parent
         self.search_results = []
+        self.search_root = None
         self.search_thread = None
+        self.scanner = None
+        # Résultats trouvés par le parcours, pas encore transmis à l'interface
+        self.pending_results = []
+        self.pending_lock = threading.Lock()
+        # Nombre de threads de lecture de dossiers pour les recherches récursives
+        self.scan_workers = 8
         self.is_searching = False
         self.thumbnail_size = 32
+        # Miniatures chargées hors du thread principal, lignes visibles d'abord
+        self.thumbnail_loader = ThumbnailLoader(self.thumbnail_size, parent=self)
+        self.thumbnail_loader.thumbnails_ready.connect(self.on_thumbnails_ready)
+        self.visible_timer = QTimer(self)
+        self.visible_timer.setSingleShot(True)
+        self.visible_timer.setInterval(30)
+        self.visible_timer.timeout.connect(self.request_visible_thumbnails)
         self.save_results = True
         self.data_manager = HeicDataManager()
         
@@ -91,6 +89,13 @@ class HeicFinderDialog(QDialog):
                 border-radius: 3px;
                 padding: 3px;
             }
+            QSpinBox {
+                background-color: #353535;
+                color: #E0E0E0;
+                border: 1px solid #505050;
+                border-radius: 3px;
+                padding: 3px;
+            }
             QComboBox {
                 background-color: #353535;
                 color: #E0E0E0;
@@ -126,13 +131,13 @@ class HeicFinderDialog(QDialog):
                 background-color: #405060;
                 width: 10px;
             }
-            QTreeWidget {
+            QTreeView {
                 background-color: #303030;
                 color: #E0E0E0;
                 border: 1px solid #404040;
                 alternate-background-color: #353535;
             }
-            QTreeWidget::item:selected {
+            QTreeView::item:selected {
                 background-color: #404050;
                 color: #FFFFFF;
             }
@@ -193,6 +198,10 @@ class HeicFinderDialog(QDialog):
         self.recursive_check = QCheckBox("Recherche récursive")
         self.recursive_check.setChecked(True)
         
+        self.sniff_check = QCheckBox("Détecter par le contenu")
+        self.sniff_check.setToolTip("Lit l'en-tête des fichiers JPEG, PNG et TIFF pour reconnaître "
+                                    "les images HEIF enregistrées sous une autre extension")
+        
         self.search_button = QPushButton("Rechercher")
         self.search_button.clicked.connect(self.start_search)
         
@@ -201,9 +210,37 @@ class HeicFinderDialog(QDialog):
         search_layout.addWidget(self.search_path)
         search_layout.addWidget(self.browse_button)
         search_layout.addWidget(self.recursive_check)
+        search_layout.addWidget(self.sniff_check)
         search_layout.addWidget(self.search_button)
         
         layout.addWidget(search_frame)
+        
+        # Règles d'exclusion appliquées pendant le parcours
+        prune_frame = QFrame()
+        prune_frame.setFrameShape(QFrame.Shape.StyledPanel)
+        prune_layout = QHBoxLayout(prune_frame)
+        
+        self.system_excludes_check = QCheckBox("Exclure les dossiers système")
+        self.system_excludes_check.setChecked(True)
+        self.exclude_patterns = QLineEdit(", ".join(DEFAULT_PATTERNS))
+        self.exclude_patterns.setToolTip("Noms de dossiers ou chemins à ignorer (motifs *, ?), séparés par des virgules")
+        self.one_filesystem_check = QCheckBox("Rester sur le même disque")
+        # Désactivé par défaut : les partitions /home et volumes de données sont parcourus
+        self.one_filesystem_check.setToolTip("Ne pas descendre dans les autres partitions ni les montages réseau")
+        self.skip_hidden_check = QCheckBox("Ignorer les dossiers cachés")
+        self.max_depth_spin = QSpinBox()
+        self.max_depth_spin.setRange(0, 100)
+        self.max_depth_spin.setSpecialValueText("illimitée")
+        
+        prune_layout.addWidget(self.system_excludes_check)
+        prune_layout.addWidget(QLabel("Motifs exclus:"))
+        prune_layout.addWidget(self.exclude_patterns)
+        prune_layout.addWidget(self.one_filesystem_check)
+        prune_layout.addWidget(self.skip_hidden_check)
+        prune_layout.addWidget(QLabel("Profondeur max:"))
+        prune_layout.addWidget(self.max_depth_spin)
+        
+        layout.addWidget(prune_frame)
         self.progress_bar = QProgressBar()
         self.progress_bar.setRange(0, 100)
         self.progress_bar.setValue(0)
@@ -213,14 +250,24 @@ class HeicFinderDialog(QDialog):
         progress_layout.addWidget(self.progress_bar)
         progress_layout.addWidget(self.progress_label)
         layout.addLayout(progress_layout)
-        self.result_tree = QTreeWidget()
-        self.result_tree.setHeaderLabels(["Nom", "Taille", "Date", "Emplacement"])
+        self.result_model = SearchResultModel(self)
+        self.result_tree = QTreeView()
+        self.result_tree.setModel(self.result_model)
+        self.result_tree.setRootIsDecorated(False)
+        self.result_tree.setUniformRowHeights(True)
+        self.result_tree.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
         self.result_tree.setColumnWidth(0, 250)
         self.result_tree.setColumnWidth(1, 100)
         self.result_tree.setColumnWidth(2, 150)
         self.result_tree.setColumnWidth(3, 350)
         self.result_tree.setAlternatingRowColors(True)
-        self.result_tree.itemDoubleClicked.connect(self.open_selected_file)
+        # Sans indicateur, les résultats restent dans l'ordre de découverte
+        self.result_tree.header().setSortIndicator(-1, Qt.SortOrder.AscendingOrder)
+        self.result_tree.setSortingEnabled(True)
+        self.result_tree.doubleClicked.connect(self.open_selected_file)
+        self.result_tree.verticalScrollBar().valueChanged.connect(self.visible_timer.start)
+        self.result_model.rowsInserted.connect(self.visible_timer.start)
+        self.result_model.layoutChanged.connect(self.visible_timer.start)
         layout.addWidget(self.result_tree)
         button_layout = QHBoxLayout()
         
@@ -245,7 +292,7 @@ class HeicFinderDialog(QDialog):
         self.location_combo.currentIndexChanged.connect(self.update_search_path)
         self.update_progress.connect(self.on_progress_update)
         self.search_completed.connect(self.on_search_completed)
-        self.add_search_result.connect(self.on_result_found)
+        self.add_search_results.connect(self.on_results_found)
         self.update_search_path()
     
     def toggle_save_results(self, checked):
@@ -294,7 +341,10 @@ class HeicFinderDialog(QDialog):
             return
         self.is_searching = True
         self.search_results = []
-        self.result_tree.clear()
+        self.search_root = search_path
+        self.pending_results = []
+        self.result_model.clear()
+        self.thumbnail_loader.clear()
         
         self.progress_bar.setValue(0)
         self.progress_label.setText("Recherche en cours...")
@@ -303,91 +353,124 @@ class HeicFinderDialog(QDialog):
         self.cancel_button.setEnabled(True)
         
         recursive = self.recursive_check.isChecked()
+        sniff_content = self.sniff_check.isChecked()
         self.data_manager.save_recent_search(search_path)
         
+        # Le nombre de dossiers du parcours précédent sert à estimer la progression
+        expected_directories = None
+        previous_scan = self.data_manager.get_scan_stats(search_path) if recursive else None
+        if previous_scan:
+            expected_directories = previous_scan["directory_count"]
+        prune_rules = self.build_prune_rules()
+        if recursive and self.scan_workers > 1:
+            self.scanner = ParallelHeicScanner(search_path, recursive, expected_directories,
+                                               sniff_content, workers=self.scan_workers,
+                                               prune_rules=prune_rules)
+        else:
+            self.scanner = HeicScanner(search_path, recursive, expected_directories, sniff_content,
+                                       prune_rules=prune_rules)
+        
         self.search_thread = threading.Thread(
             target=self.search_heic_files,
-            args=(search_path, recursive)
+            args=(self.scanner,)
         )
         self.search_thread.daemon = True
         self.search_thread.start()
     
+    def build_prune_rules(self):
+        """Règles d'exclusion correspondant aux options de la fenêtre"""
+        patterns = [pattern.strip() for pattern in self.exclude_patterns.text().split(",") if pattern.strip()]
+        excluded_paths = DEFAULT_SYSTEM_EXCLUDES if self.system_excludes_check.isChecked() else ()
+        return PruneRules(excluded_paths, patterns,
+                          one_filesystem=self.one_filesystem_check.isChecked(),
+                          max_depth=self.max_depth_spin.value() or None,
+                          skip_hidden=self.skip_hidden_check.isChecked())
+    
     def cancel_search(self):
         if self.is_searching and self.search_thread:
             self.is_searching = False
+            self.scanner.cancel()
             self.cancel_button.setEnabled(False)
             self.progress_label.setText("Annulation de la recherche...")
     
-    def search_heic_files(self, root_path, recursive):
+    def search_heic_files(self, scanner):
+        """Parcours en un seul passage : les résultats arrivent dès le premier dossier"""
         try:
-            file_count = 0
-            total_files = 0
-
-            if recursive:
-                for root, _, files in os.walk(root_path):
-                    total_files += len(files)
-            else:
-                total_files = len(os.listdir(root_path))
-            if recursive:
-                for root, _, files in os.walk(root_path):
-                    if not self.is_searching:
-                        break
-                        
-                    for file in files:
-                        if not self.is_searching:
-                            break
-                            
-                        file_count += 1
-                        if file_count % 50 == 0:
-                            progress = int((file_count / total_files) * 100) if total_files else 0
-                            self.update_progress.emit(progress, f"Recherche: {file_count}/{total_files} fichiers examinés")
-                        
-                        if file.lower().endswith(('.heic', '.heif')):
-                            full_path = os.path.join(root, file)
-                            self.add_search_result.emit(full_path)
-            else:
-                for item in os.listdir(root_path):
-                    if not self.is_searching:
-                        break
-                        
-                    file_count += 1
-                    if file_count % 50 == 0:
-                        progress = int((file_count / total_files) * 100) if total_files else 0
-                        self.update_progress.emit(progress, f"Recherche: {file_count}/{total_files} fichiers examinés")
-                    
-                    full_path = os.path.join(root_path, item)
-                    if os.path.isfile(full_path) and item.lower().endswith(('.heic', '.heif')):
-                        self.add_search_result.emit(full_path)
-            self.search_completed.emit(len(self.search_results))
+            if scanner.recursive:
+                # Les dossiers inchangés depuis le parcours précédent ne sont pas relus
+                scanner.snapshot = self.data_manager.load_scan_snapshot(scanner.root_path,
+                                                                        scanner.snapshot_options())
+            stats = scanner.scan(self.queue_result, on_progress=self.report_scan_progress)
+            self.flush_results()
+            if scanner.recursive and not scanner.is_cancelled():
+                self.data_manager.save_scan_stats(scanner.root_path, stats.dirs_done, stats.files_seen)
+                self.data_manager.save_scan_snapshot(scanner.root_path, scanner.snapshot_options(),
+                                                     scanner.new_snapshot)
+            self.search_completed.emit(stats.matches)
             
         except Exception as e:
             self.update_progress.emit(0, f"Erreur: {str(e)}")
             self.search_completed.emit(-1)
     
+    def queue_result(self, file_path, size, mtime):
+        """Appelé par les threads du parcours pour chaque fichier trouvé"""
+        result = make_search_result(file_path, size, mtime)
+        with self.pending_lock:
+            self.pending_results.append(result)
+    
+    def flush_results(self):
+        """Transmet à l'interface les résultats accumulés depuis le dernier lot"""
+        with self.pending_lock:
+            batch, self.pending_results = self.pending_results, []
+        if batch:
+            self.add_search_results.emit(batch)
+    
+    def report_scan_progress(self, scanner):
+        self.flush_results()
+        stats = scanner.stats
+        self.update_progress.emit(
+            scanner.progress(),
+            f"Recherche: {stats.dirs_done}/{stats.dirs_discovered} dossiers, {stats.files_seen} fichiers examinés"
+        )
+    
     def on_progress_update(self, progress, message):
         self.progress_bar.setValue(progress)
         self.progress_label.setText(message)
     
-    def on_result_found(self, file_path):
-        self.search_results.append(file_path)
-        item = SearchResultItem(file_path)
-        self.result_tree.addTopLevelItem(item)
-        QTimer.singleShot(10, lambda: self.load_thumbnail_for_item(item))
+    def on_results_found(self, results):
+        self.search_results.extend(result.path for result in results)
+        self.result_model.add_results(results)
+        # Vue défilée jusqu'en bas : exposer les nouvelles lignes sans attendre
+        scroll_bar = self.result_tree.verticalScrollBar()
+        if scroll_bar.value() == scroll_bar.maximum() and self.result_model.canFetchMore():
+            self.result_model.fetchMore()
     
-    def load_thumbnail_for_item(self, item):
-        try:
-            if not hasattr(item, 'thumbnail_loaded') or item.thumbnail_loaded:
-                return
-                
-            _, pixmap = load_image(item.file_path, 50)
-            if pixmap:
-                icon_pixmap = pixmap.scaled(QSize(self.thumbnail_size, self.thumbnail_size), 
-                                           Qt.AspectRatioMode.KeepAspectRatio,
-                                           Qt.TransformationMode.SmoothTransformation)
-                item.setIcon(0, QIcon(icon_pixmap))
-                item.thumbnail_loaded = True
-        except:
-            pass
+    def request_visible_thumbnails(self):
+        """Demande les miniatures des lignes affichées, puis celles des pages voisines"""
+        row_count = self.result_model.rowCount()
+        if not row_count:
+            return
+        viewport = self.result_tree.viewport()
+        first = self.result_tree.indexAt(QPoint(0, 0)).row()
+        last = self.result_tree.indexAt(QPoint(0, viewport.height() - 1)).row()
+        first = max(first, 0)
+        last = last if last >= 0 else row_count - 1
+        page = last - first + 1
+        
+        def paths(start, end):
+            return [self.result_model.result_at(row).path
+                    for row in range(max(start, 0), min(end, row_count))]
+        
+        nearby = paths(last + 1, last + 1 + page) + paths(first - page, first)
+        self.thumbnail_loader.request(paths(first, last + 1), nearby)
+    
+    def on_thumbnails_ready(self, thumbnails):
+        icons = {}
+        for file_path, image in thumbnails:
+            if not image.isNull():
+                icons[file_path] = QIcon(QPixmap.fromImage(image))
+        if icons:
+            self.result_model.set_icons(icons)
     
     def on_search_completed(self, count):
         self.is_searching = False
@@ -396,28 +479,44 @@ class HeicFinderDialog(QDialog):
         
         if count >= 0:
             self.progress_bar.setValue(100)
-            self.progress_label.setText(f"Recherche terminée. {count} fichiers HEIC trouvés.")
+            message = f"Recherche terminée. {count} fichiers HEIC trouvés."
+            stats = self.scanner.stats
+            if self.scanner.sniff_content:
+                message += (f" ({stats.extension_matches} par extension, {stats.sniff_matches} par le contenu"
+                            f" sur {stats.files_sniffed} fichiers lus)")
+            if stats.dirs_pruned:
+                details = ", ".join(f"{reason} {number}" for reason, number in stats.dirs_pruned.most_common())
+                message += f" {sum(stats.dirs_pruned.values())} dossiers ignorés ({details})."
+            if stats.dirs_reused:
+                message += f" {stats.dirs_reused}/{stats.dirs_done} dossiers inchangés non relus."
+            self.progress_label.setText(message)
             
             if self.save_results and count > 0:
-                self.data_manager.add_search_result(self.search_results)
+                self.data_manager.add_image_entries(self.result_model.entries(), self.search_root)
         else:
             self.progress_bar.setValue(0)
             self.progress_label.setText("Recherche échouée.")
     
     def open_selected_file(self):
-        selected_items = self.result_tree.selectedItems()
-        if not selected_items:
+        selected_rows = self.result_tree.selectionModel().selectedRows()
+        if not selected_rows:
             QMessageBox.information(self, "Sélection", "Veuillez sélectionner une image à ouvrir.")
             return
             
-        item = selected_items[0]
-        if hasattr(item, 'file_path') and os.path.isfile(item.file_path):
-            if self.save_results and self.parent_viewer and self.search_results:
-                self.parent_viewer.set_search_results(self.search_results)
-            
+        file_path = self.result_model.result_at(selected_rows[0].row()).path
+        if os.path.isfile(file_path):
+            # accept() transmet les résultats au visualiseur
             self.accept()
             if self.parent_viewer:
-                self.parent_viewer.open_heic_file(item.file_path)
+                self.parent_viewer.open_heic_file(file_path)
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self.visible_timer.start()
+
+    def done(self, result):
+        self.thumbnail_loader.shutdown()
+        super().done(result)
 
     def accept(self):
         if self.save_results and self.parent_viewer and self.search_results:
@@ -0,0 +1,128 @@
+import sys
+from PyQt6.QtWidgets import QWidget
+from PyQt6.QtCore import Qt, QPoint, QRectF, QSize
+from PyQt6.QtGui import QPainter
+
+
+class ImageCanvas(QWidget):
+    """Zone d'affichage de l'image principale, placée dans un QScrollArea.
+
+    Le widget prend la taille de l'image mise à l'échelle, mais seule la région
+    exposée est dessinée, à partir du niveau de pyramide adapté. Aucune image
+    de la taille du zoom n'est jamais allouée : la mémoire reste constante
+    quel que soit le facteur de zoom.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.pyramid = None
+        self.source_size = QSize()
+        self.scale = 1.0
+        # Image entièrement mise à l'échelle, conservée uniquement lorsqu'elle
+        # tient dans la zone visible (ajustement à la fenêtre)
+        self._fitted_image = None
+
+    def has_image(self):
+        return self.pyramid is not None
+
+    def set_pyramid(self, pyramid, source_size=None):
+        """Affiche une nouvelle pyramide.
+
+        `source_size` est la taille de référence de l'image (par défaut celle
+        de la pyramide) : les échelles et les positions s'expriment par
+        rapport à elle.
+        """
+        self.pyramid = pyramid
+        self.source_size = source_size or pyramid.image.size()
+        self._update_geometry()
+
+    def clear(self):
+        self.pyramid = None
+        self.source_size = QSize()
+        self._update_geometry()
+
+    def set_scale(self, scale):
+        self.scale = scale
+        self._update_geometry()
+
+    def display_size(self):
+        """Taille de l'image à l'échelle courante, en pixels d'écran"""
+        if not self.pyramid:
+            return QSize()
+        return QSize(max(1, int(self.source_size.width() * self.scale)),
+                     max(1, int(self.source_size.height() * self.scale)))
+
+    def image_offset(self):
+        """Décalage de l'image dans le widget lorsqu'elle est centrée"""
+        size = self.display_size()
+        return QPoint(max(0, (self.width() - size.width()) // 2),
+                      max(0, (self.height() - size.height()) // 2))
+
+    def sizeHint(self):
+        return self.display_size()
+
+    def minimumSizeHint(self):
+        return self.display_size()
+
+    def paintEvent(self, event):
+        if not self.pyramid:
+            return
+        size = self.display_size()
+        offset = self.image_offset()
+        image_rect = QRectF(offset.x(), offset.y(), size.width(), size.height())
+        target = QRectF(event.rect()).intersected(image_rect)
+        if target.isEmpty():
+            return
+
+        painter = QPainter(self)
+        fitted_image = self._get_fitted_image(size)
+        if fitted_image is not None:
+            source = target.translated(-offset.x(), -offset.y())
+            painter.drawImage(target, fitted_image, source)
+            return
+
+        # Seule la région exposée est rééchantillonnée depuis le niveau adapté
+        level, _ = self.pyramid.level_for_scale(self._pyramid_scale())
+        ratio_x = level.width() / size.width()
+        ratio_y = level.height() / size.height()
+        source = QRectF(
+            (target.x() - offset.x()) * ratio_x,
+            (target.y() - offset.y()) * ratio_y,
+            target.width() * ratio_x,
+            target.height() * ratio_y
+        )
+        painter.setRenderHint(QPainter.RenderHint.SmoothPixmapTransform)
+        painter.drawImage(target, level, source)
+
+    def _pyramid_scale(self):
+        """Échelle à appliquer à la pyramide pour obtenir l'échelle d'affichage"""
+        return self.scale * self.source_size.width() / self.pyramid.image.width()
+
+    def _get_fitted_image(self, size):
+        viewport = self.parentWidget()
+        if viewport is None or size.width() > viewport.width() or size.height() > viewport.height():
+            self._fitted_image = None
+            return None
+        if self._fitted_image is None or self._fitted_image.size() != size:
+            pyramid_scale = self._pyramid_scale()
+            if sys.platform == "win32":
+                # Sur Windows, un suréchantillonnage intermédiaire donne un meilleur rendu
+                intermediate_image = self.pyramid.scaled(pyramid_scale * 1.5)
+                self._fitted_image = intermediate_image.scaled(
+                    size,
+                    Qt.AspectRatioMode.IgnoreAspectRatio,
+                    Qt.TransformationMode.SmoothTransformation
+                )
+            else:
+                self._fitted_image = self.pyramid.scaled(pyramid_scale).scaled(
+                    size,
+                    Qt.AspectRatioMode.IgnoreAspectRatio,
+                    Qt.TransformationMode.SmoothTransformation
+                )
+        return self._fitted_image
+
+    def _update_geometry(self):
+        self._fitted_image = None
+        self.setMinimumSize(self.display_size() if self.pyramid else QSize(0, 0))
+        self.updateGeometry()
+        self.update()
@@ -0,0 +1,145 @@
+import os
+import time
+from collections import namedtuple
+from operator import attrgetter
+from PyQt6.QtCore import Qt, QAbstractTableModel, QModelIndex
+
+# Un résultat de recherche ; name_key sert au tri par nom sans distinction de casse
+SearchResult = namedtuple("SearchResult", "path name size mtime directory name_key")
+
+
+def make_search_result(path, size, mtime):
+    name = os.path.basename(path)
+    return SearchResult(path, name, size, mtime, os.path.dirname(path), name.lower())
+
+
+class SearchResultModel(QAbstractTableModel):
+    """Modèle des résultats de la recherche HEIC, affiché par un QTreeView.
+
+    Les résultats sont conservés sous forme de tuples ; les lignes ne sont
+    exposées à la vue que par paquets (canFetchMore/fetchMore) et le texte des
+    cellules n'est formaté que pour les lignes affichées.
+    """
+
+    HEADERS = ["Nom", "Taille", "Date", "Emplacement"]
+    # Clé de tri de chaque colonne
+    SORT_KEYS = [attrgetter("name_key"), attrgetter("size"), attrgetter("mtime"), attrgetter("directory")]
+    # Nombre de lignes exposées à chaque fetchMore
+    FETCH_BATCH = 500
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._results = []
+        self._loaded = 0
+        self._icons = {}
+        self._sort_column = -1
+        self._sort_order = Qt.SortOrder.AscendingOrder
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self._loaded
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        result = self._results[index.row()]
+        column = index.column()
+        if role == Qt.ItemDataRole.DisplayRole:
+            if column == 0:
+                return result.name
+            if column == 1:
+                return f"{result.size / 1024:.1f} Ko"
+            if column == 2:
+                return time.strftime('%d/%m/%Y %H:%M', time.localtime(result.mtime))
+            return result.directory
+        if role == Qt.ItemDataRole.DecorationRole and column == 0:
+            return self._icons.get(result.path)
+        if role == Qt.ItemDataRole.ToolTipRole:
+            return result.path
+        if role == Qt.ItemDataRole.UserRole:
+            return result.path
+        return None
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if orientation == Qt.Orientation.Horizontal and role == Qt.ItemDataRole.DisplayRole:
+            return self.HEADERS[section]
+        return None
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and self._loaded < len(self._results)
+
+    def fetchMore(self, parent=QModelIndex()):
+        count = min(self.FETCH_BATCH, len(self._results) - self._loaded)
+        if count <= 0:
+            return
+        self.beginInsertRows(QModelIndex(), self._loaded, self._loaded + count - 1)
+        self._loaded += count
+        self.endInsertRows()
+
+    def sort(self, column, order=Qt.SortOrder.AscendingOrder):
+        self._sort_column = column
+        self._sort_order = order
+        if column < 0:
+            return
+        self.layoutAboutToBeChanged.emit()
+        self._sort_results()
+        self.layoutChanged.emit()
+
+    def add_results(self, results):
+        """Ajoute un lot de résultats (SearchResult)"""
+        if not results:
+            return
+        if self._sort_column < 0:
+            self._results.extend(results)
+        else:
+            # Les lignes déjà triées forment une séquence que le tri reconnaît :
+            # seul le nouveau lot est réellement trié avant la fusion
+            self.layoutAboutToBeChanged.emit()
+            self._results.extend(results)
+            self._sort_results()
+            self.layoutChanged.emit()
+        # Remplir la première page sans attendre un défilement de la vue
+        if self._loaded < self.FETCH_BATCH:
+            self.fetchMore()
+
+    def _sort_results(self):
+        """Trie les résultats en conservant les index persistants (sélection)"""
+        persistent = self.persistentIndexList()
+        paths = [self._results[index.row()].path for index in persistent]
+        self._results.sort(key=self.SORT_KEYS[self._sort_column],
+                           reverse=self._sort_order == Qt.SortOrder.DescendingOrder)
+        if not persistent:
+            return
+        wanted = set(paths)
+        rows = {result.path: row for row, result in enumerate(self._results) if result.path in wanted}
+        self.changePersistentIndexList(persistent, [
+            self.index(rows[path], index.column()) if rows[path] < self._loaded else QModelIndex()
+            for index, path in zip(persistent, paths)
+        ])
+
+    def clear(self):
+        self.beginResetModel()
+        self._results = []
+        self._loaded = 0
+        self._icons = {}
+        self.endResetModel()
+
+    def result_at(self, row):
+        return self._results[row]
+
+    def set_icons(self, icons):
+        """Applique un lot de miniatures {chemin: QIcon}"""
+        self._icons.update(icons)
+        if self._loaded:
+            # Un seul signal pour le lot : la vue ne repeint que les lignes visibles
+            self.dataChanged.emit(self.index(0, 0), self.index(self._loaded - 1, 0),
+                                  [Qt.ItemDataRole.DecorationRole])
+
+    def paths(self):
+        return [result.path for result in self._results]
+
+    def entries(self):
+        """Résultats sous forme (chemin, taille, mtime) pour l'index des images"""
+        return [(result.path, result.size, result.mtime) for result in self._results]
@@ -43,18 +43,11 @@ def create_menu(window):
     fit_action.setShortcut("Ctrl+0")
     fit_action.triggered.connect(window.fit_to_window)
     view_menu.addAction(fit_action)
-    quality_menu = view_menu.addMenu("&Qualité d'affichage")
-    high_quality_action = QAction("&Haute (Par défaut)", window)
-    high_quality_action.triggered.connect(lambda: window.set_quality(100))
-    quality_menu.addAction(high_quality_action)
     
-    medium_quality_action = QAction("&Moyenne", window)
-    medium_quality_action.triggered.connect(lambda: window.set_quality(80))
-    quality_menu.addAction(medium_quality_action)
-    
-    low_quality_action = QAction("&Basse", window)
-    low_quality_action.triggered.connect(lambda: window.set_quality(60))
-    quality_menu.addAction(low_quality_action)
+    sniff_action = QAction("Détecter les HEIF par le &contenu", window)
+    sniff_action.setCheckable(True)
+    sniff_action.toggled.connect(window.set_content_sniffing)
+    view_menu.addAction(sniff_action)
     help_menu = menubar.addMenu("&Aide")
     about_action = QAction("&À propos", window)
     about_action.triggered.connect(window.show_about_dialog)
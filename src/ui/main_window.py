@@ -1,5 +1,6 @@
 import os
 import sys
+import time
 from PyQt6.QtWidgets import (QMainWindow, QLabel, QScrollArea, 
                             QStatusBar, QMessageBox, QFileDialog,
                             QDialog, QVBoxLayout, QHBoxLayout, QPushButton,
@@ -8,7 +9,15 @@ from PyQt6.QtCore import Qt, QStandardPaths, QPoint, QSize
 from PyQt6.QtGui import QPixmap, QKeySequence, QShortcut, QIcon
 
 from src.ui.components.ui_components import create_menu, create_toolbar
-from src.core.image_processing import load_image
+from src.ui.components.image_canvas import ImageCanvas
+from src.core.image_cache import ImageCache
+from src.core.prefetcher import ImagePrefetcher
+from src.core.image_loader import AsyncImageLoader, fit_variant
+from src.core.image_pyramid import ImagePyramid
+from src.core.directory_index import DirectoryIndex
+from src.core.playlist import Playlist
+from src.core.path_validator import PathValidator
+from src.core.thumbnail_loader import get_thumbnail_service
 from src.utils.file_utils import show_about_dialog, show_association_dialog, create_file_association
 from src.ui.components.gallery import ImageGalleryDialog
 from src.ui.components.heic_finder import show_heic_finder as show_finder_dialog
@@ -21,16 +30,38 @@ class HeicViewer(QMainWindow):
         
         self.current_image = None
         self.current_file_path = None
-        self.current_pixmap = None
+        self.current_pyramid = None
         self.is_fit_to_window = True
-        self.jpeg_quality = 100
         self.zoom_factor = 1.2
         self.current_scale = 1.0
-        self.image_files = []
-        self.search_results = []
+        self.image_files = Playlist()
+        self.search_results = Playlist()
         self.current_index = -1
         self.using_search_results = False
         self.data_manager = HeicDataManager()
+        # Cache des images décodées pour une navigation instantanée
+        self.image_cache = ImageCache(max_memory_mb=512)
+        # Préchargement des images voisines dans le sens de la navigation
+        self.prefetcher = ImagePrefetcher(self.image_cache, ahead=2, behind=1)
+        self.navigation_direction = 1
+        # Décodage et conversion hors du thread principal
+        self.image_loader = AsyncImageLoader(self.image_cache, self.prefetcher, parent=self)
+        self.image_loader.preview_loaded.connect(self.on_preview_loaded)
+        self.image_loader.image_loaded.connect(self.on_image_loaded)
+        # Listes des dossiers mises en cache et surveillées
+        self.directory_index = DirectoryIndex(parent=self)
+        self.directory_index.directory_changed.connect(self.on_directory_changed)
+        # Vérification en arrière-plan des images sauvegardées
+        self.path_validator = PathValidator(parent=self)
+        self.path_validator.paths_missing.connect(self.on_saved_paths_missing)
+        self.path_validator.validation_finished.connect(self.on_saved_paths_validated)
+        # Mesures du dernier chargement : premier affichage et pleine qualité
+        self.open_started_at = 0.0
+        self.open_timings = {}
+        self.preview_request_id = None
+        # Demande en cours pour l'image courante (ouverture ou résolution supérieure)
+        self.loading_request_id = None
+        self.image_loader.load_failed.connect(self.on_image_load_failed)
         
         # Appliquer le thème sombre à l'application principale
         self.setStyleSheet("""
@@ -135,9 +166,8 @@ class HeicViewer(QMainWindow):
         self.scroll_area = QScrollArea()
         self.scroll_area.setWidgetResizable(True)
         self.scroll_area.viewport().installEventFilter(self)
-        self.image_label = QLabel()
-        self.image_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        self.scroll_area.setWidget(self.image_label)
+        self.image_canvas = ImageCanvas()
+        self.scroll_area.setWidget(self.image_canvas)
         self.setCentralWidget(self.scroll_area)
         create_menu(self)
         create_toolbar(self)
@@ -181,66 +211,189 @@ class HeicViewer(QMainWindow):
             self,
             "Ouvrir une image HEIC",
             QStandardPaths.writableLocation(QStandardPaths.StandardLocation.PicturesLocation),
-            "Images HEIC (*.heic *.HEIC);;Toutes les images (*.*);;Tous les fichiers (*)"
+            "Images HEIC (*.heic *.HEIC *.heif *.hif *.avif);;Toutes les images (*.*);;Tous les fichiers (*)"
         )
         if file_path:
             self.open_heic_file(file_path)
     
-    def set_quality(self, quality):
-        self.jpeg_quality = quality
+    def set_content_sniffing(self, enabled):
+        """Reconnaît aussi les fichiers HEIF enregistrés sous une autre extension"""
+        self.directory_index.set_sniff_content(enabled)
         if self.current_file_path:
-            self.reload_current_image()
+            self.update_image_files_list(self.current_file_path)
     
     def reload_current_image(self):
         if self.current_file_path:
             self.open_heic_file(self.current_file_path)
             
     def open_heic_file(self, file_path):
+        """Demande le chargement d'une image ; l'affichage se fait à la réception"""
         try:
             self.current_file_path = file_path
-            self.current_image, self.current_pixmap = load_image(file_path, self.jpeg_quality)
-            self.current_scale = 1.0
             self.update_image_files_list(file_path)
-            if self.is_fit_to_window:
-                self.fit_to_window()
-            else:
-                self.show_original_size()
-            img_size = self.current_image.size
-            nav_info = f" - Image {self.current_index + 1}/{len(self.image_files)}" if self.image_files else ""
-            self.status_bar.showMessage(f"{os.path.basename(file_path)} - {img_size[0]}x{img_size[1]} pixels{nav_info}")
-            self.setWindowTitle(f"HeicViewer - {os.path.basename(file_path)}")
-            
         except Exception as e:
             QMessageBox.critical(
                 self, 
                 "Erreur lors de l'ouverture",
                 f"Impossible d'ouvrir {file_path}:\n{str(e)}"
             )
+            return
+        self.status_bar.showMessage(f"Chargement de {os.path.basename(file_path)}...")
+        self.open_started_at = time.perf_counter()
+        self.open_timings = {}
+        self.preview_request_id = None
+        preview_size = self.fit_target_size()
+        # Ajustée à la fenêtre, l'image est décodée à la taille de l'écran ;
+        # la pleine résolution n'est chargée que si le zoom la rend utile
+        target_size = preview_size if self.is_fit_to_window else None
+        self.prefetcher.set_variant(fit_variant(target_size))
+        self.loading_request_id = self.image_loader.request(file_path, preview_size=preview_size,
+                                                            target_size=target_size)
+    
+    def fit_target_size(self):
+        viewport = self.scroll_area.viewport()
+        return max(viewport.width(), viewport.height())
+    
+    def ensure_resolution(self):
+        """Charge une version plus détaillée lorsque l'échelle d'affichage dépasse celle de l'image chargée"""
+        if not self.current_image or not self.current_file_path or self.loading_request_id is not None:
+            return
+        source_size = self.image_canvas.source_size
+        if self.current_image.width() >= source_size.width():
+            return
+        if self.current_scale * source_size.width() <= self.current_image.width() + 1:
+            return
+        target_size = self.fit_target_size() if self.is_fit_to_window else None
+        self.open_started_at = time.perf_counter()
+        self.open_timings = {"detail": True}
+        self.loading_request_id = self.image_loader.request(self.current_file_path,
+                                                            target_size=target_size)
+        # L'image affichée sera remplacée en conservant zoom et position
+        self.preview_request_id = self.loading_request_id
+        self.status_bar.showMessage(f"{os.path.basename(self.current_file_path)} - chargement de la pleine résolution...")
+    
+    def set_displayed_image(self, image, source_size=None):
+        """Remplace l'image affichée (aperçu ou pleine résolution)"""
+        self.current_image = image
+        if self.current_pyramid:
+            self.current_pyramid.cancel()
+        self.current_pyramid = ImagePyramid(image)
+        self.current_pyramid.build_async()
+        self.image_canvas.set_pyramid(self.current_pyramid, source_size)
+    
+    def on_preview_loaded(self, request_id, file_path, preview, full_size):
+        if not self.image_loader.is_current(request_id):
+            return
+        self.preview_request_id = request_id
+        self.open_timings["time_to_first_pixel"] = time.perf_counter() - self.open_started_at
+        # L'aperçu est affiché à la taille de l'image complète : zoom et
+        # défilement restent valables lorsque celle-ci le remplace
+        self.set_displayed_image(preview, full_size)
+        self.current_scale = 1.0
+        if self.is_fit_to_window:
+            self.fit_to_window()
+        else:
+            self.show_original_size()
+        self.status_bar.showMessage(f"{os.path.basename(file_path)} - aperçu, chargement de la pleine résolution...")
+    
+    def on_image_loaded(self, request_id, file_path, image, full_size):
+        # Une demande plus récente a été faite entre-temps : résultat ignoré
+        if not self.image_loader.is_current(request_id):
+            return
+        self.loading_request_id = None
+        elapsed = time.perf_counter() - self.open_started_at
+        self.open_timings.setdefault("time_to_first_pixel", elapsed)
+        self.open_timings["time_to_full_quality"] = elapsed
+        # Un aperçu déjà affiché est remplacé en conservant zoom et position
+        self.set_displayed_image(image, full_size)
+        if self.preview_request_id != request_id:
+            self.current_scale = 1.0
+            if self.is_fit_to_window:
+                self.fit_to_window()
+            else:
+                self.show_original_size()
+        self.data_manager.update_dimensions(file_path, full_size.width(), full_size.height())
+        nav_info = f" - Image {self.current_index + 1}/{len(self.image_files)}" if self.image_files else ""
+        if self.open_timings.get("detail"):
+            timing_info = f" - pleine résolution chargée en {elapsed * 1000:.0f} ms"
+        else:
+            timing_info = (f" - affichée en {self.open_timings['time_to_first_pixel'] * 1000:.0f} ms,"
+                           f" pleine qualité en {elapsed * 1000:.0f} ms")
+        if image.width() < full_size.width():
+            timing_info += f" (réduite à {image.width()}x{image.height()})"
+        self.status_bar.showMessage(f"{os.path.basename(file_path)} - {full_size.width()}x{full_size.height()} pixels{nav_info}{timing_info}")
+        self.setWindowTitle(f"HeicViewer - {os.path.basename(file_path)}")
+        self.schedule_prefetch()
+        # Le zoom a pu changer pendant le chargement
+        self.ensure_resolution()
+    
+    def on_image_load_failed(self, request_id, file_path, error):
+        if not self.image_loader.is_current(request_id):
+            return
+        self.loading_request_id = None
+        self.status_bar.clearMessage()
+        QMessageBox.critical(
+            self, 
+            "Erreur lors de l'ouverture",
+            f"Impossible d'ouvrir {file_path}:\n{error}"
+        )
+    
+    def schedule_prefetch(self):
+        """Précharge les voisins de l'image courante dans la liste active"""
+        if self.using_search_results and self.current_file_path in self.search_results:
+            active_list = self.search_results
+            index = self.search_results.index(self.current_file_path)
+        else:
+            active_list = self.image_files
+            index = self.current_index
+        self.prefetcher.update(active_list, index, self.navigation_direction)
     
     def update_image_files_list(self, current_file_path):
         directory = os.path.dirname(current_file_path)
-        self.image_files = []
-        for filename in sorted(os.listdir(directory)):
-            if filename.lower().endswith(('.heic', '.heif')):
-                full_path = os.path.join(directory, filename)
-                self.image_files.append(full_path)
+        self.image_files = self.directory_index.files_in(directory)
         try:
             self.current_index = self.image_files.index(current_file_path)
         except ValueError:
             self.current_index = -1
             
+    def on_directory_changed(self, directory, added, removed):
+        """Met à jour la navigation après une modification externe du dossier courant"""
+        if self.current_file_path and os.path.dirname(self.current_file_path) == directory:
+            try:
+                self.update_image_files_list(self.current_file_path)
+            except OSError:
+                # Dossier supprimé ou démonté : plus rien à parcourir ni à précharger
+                self.image_files = Playlist()
+                self.current_index = -1
+                self.prefetcher.cancel()
+                return
+            self.schedule_prefetch()
+            
     def set_search_results(self, results):
         if results:
-            self.search_results = results
+            self.search_results = Playlist(results)
             self.status_bar.showMessage(f"{len(results)} images HEIC trouvées - Utilisez 'Voir tout' pour les afficher")
             self.data_manager.add_search_result(results)
 
     def load_saved_images(self):
         """Charge les images sauvegardées au démarrage de l'application"""
-        saved_images = self.data_manager.load_images()
+        # La liste est affichée immédiatement, puis vérifiée en arrière-plan
+        saved_images = self.data_manager.load_images(check_exists=False)
         if saved_images:
-            self.search_results = saved_images
-            self.status_bar.showMessage(f"{len(saved_images)} images HEIC chargées depuis la session précédente")
+            self.search_results = Playlist(saved_images)
+            self.status_bar.showMessage(f"{len(saved_images)} images HEIC chargées depuis la session précédente (non vérifiées)")
+            self.path_validator.start(saved_images)
+
+    def on_saved_paths_missing(self, missing_paths):
+        """Retire au fur et à mesure les images sauvegardées introuvables"""
+        self.search_results.remove_many(missing_paths)
+        self.data_manager.remove_images(missing_paths)
+
+    def on_saved_paths_validated(self, checked_count, missing_count):
+        if missing_count and not self.current_file_path:
+            self.status_bar.showMessage(
+                f"{checked_count - missing_count} images HEIC vérifiées - {missing_count} introuvables retirées"
+            )
 
     def view_all_images(self):
         if self.search_results and (not self.image_files or self.using_search_results):
@@ -272,6 +425,7 @@ class HeicViewer(QMainWindow):
             QMessageBox.information(self, "Information", "Aucune image HEIC disponible.")
     
     def next_image(self):
+        self.navigation_direction = 1
         if self.using_search_results and self.search_results:
             if self.current_file_path in self.search_results:
                 current_idx = self.search_results.index(self.current_file_path)
@@ -284,6 +438,7 @@ class HeicViewer(QMainWindow):
             self.open_heic_file(self.image_files[self.current_index])
     
     def prev_image(self):
+        self.navigation_direction = -1
         if self.using_search_results and self.search_results:
             if self.current_file_path in self.search_results:
                 current_idx = self.search_results.index(self.current_file_path)
@@ -298,106 +453,67 @@ class HeicViewer(QMainWindow):
     def show_heic_finder(self):
         show_finder_dialog(self)
     
-    def display_pixmap(self, pixmap):
-        if pixmap:
-            self.image_label.setPixmap(pixmap)
+    def display_scale(self):
+        """Applique l'échelle courante à la zone d'affichage"""
+        self.image_canvas.set_scale(self.current_scale)
+        self.ensure_resolution()
             
     def zoom_in(self, pos=None):
-        if self.current_pixmap:
+        if self.current_image:
             self.is_fit_to_window = False
-            scroll_pos_before = self.scroll_area.horizontalScrollBar().value(), self.scroll_area.verticalScrollBar().value()
-            rel_pos = get_relative_position(pos, self.image_label, self.scroll_area) if pos else None
+            rel_pos = get_relative_position(pos, self.image_canvas, self.scroll_area) if pos else None
             self.current_scale *= self.zoom_factor
-            width = int(self.current_pixmap.width() * self.current_scale)
-            height = int(self.current_pixmap.height() * self.current_scale)
-            scaled_pixmap = self.current_pixmap.scaled(
-                width, height, 
-                Qt.AspectRatioMode.KeepAspectRatio, 
-                Qt.TransformationMode.SmoothTransformation
-            )
-            self.image_label.setPixmap(scaled_pixmap)
+            self.display_scale()
             self.status_bar.showMessage(f"Zoom: {int(self.current_scale * 100)}%")
             if rel_pos:
-                adjust_scroll_position(rel_pos, self.scroll_area, self.image_label)
+                adjust_scroll_position(rel_pos, self.scroll_area, self.image_canvas)
     
     def zoom_out(self, pos=None):
-        if self.current_pixmap:
+        if self.current_image:
             self.is_fit_to_window = False
-            scroll_pos_before = self.scroll_area.horizontalScrollBar().value(), self.scroll_area.verticalScrollBar().value()
-            rel_pos = get_relative_position(pos, self.image_label, self.scroll_area) if pos else None
+            rel_pos = get_relative_position(pos, self.image_canvas, self.scroll_area) if pos else None
             self.current_scale /= self.zoom_factor
             if self.current_scale < 0.1:
                 self.current_scale = 0.1
-            width = int(self.current_pixmap.width() * self.current_scale)
-            height = int(self.current_pixmap.height() * self.current_scale)
-            scaled_pixmap = self.current_pixmap.scaled(
-                width, height, 
-                Qt.AspectRatioMode.KeepAspectRatio, 
-                Qt.TransformationMode.SmoothTransformation
-            )
-            self.image_label.setPixmap(scaled_pixmap)
+            self.display_scale()
             self.status_bar.showMessage(f"Zoom: {int(self.current_scale * 100)}%")
             if rel_pos:
-                adjust_scroll_position(rel_pos, self.scroll_area, self.image_label)
+                adjust_scroll_position(rel_pos, self.scroll_area, self.image_canvas)
     
     def fit_to_window(self):
-        if self.current_pixmap:
+        if self.current_image:
             self.is_fit_to_window = True
             scroll_area_size = self.scroll_area.viewport().size()
-            original_size = self.current_pixmap.size()
+            original_size = self.image_canvas.source_size
             scale_w = scroll_area_size.width() / original_size.width()
             scale_h = scroll_area_size.height() / original_size.height()
             self.current_scale = min(scale_w, scale_h)
             if self.current_scale > 2.0:
                 self.current_scale = 2.0
             
-            # Modification pour améliorer la qualité sur Windows
-            target_width = int(original_size.width() * self.current_scale)
-            target_height = int(original_size.height() * self.current_scale)
-            
-            # Utiliser la meilleure qualité de transformation disponible
-            # et un facteur de sur-échantillonnage pour Windows
-            if sys.platform == "win32":
-                # Sur Windows, on utilise une image intermédiaire plus grande pour ensuite la réduire
-                # Ce qui donne un meilleur résultat visuel (suréchantillonnage)
-                oversample_factor = 1.5
-                intermediate_width = int(target_width * oversample_factor)
-                intermediate_height = int(target_height * oversample_factor)
-                
-                # Créer une version intermédiaire avec suréchantillonnage
-                intermediate_pixmap = self.current_pixmap.scaled(
-                    intermediate_width, intermediate_height,
-                    Qt.AspectRatioMode.KeepAspectRatio,
-                    Qt.TransformationMode.SmoothTransformation
-                )
-                
-                # Réduire à la taille cible avec transformation douce
-                scaled_pixmap = intermediate_pixmap.scaled(
-                    target_width, target_height,
-                    Qt.AspectRatioMode.KeepAspectRatio,
-                    Qt.TransformationMode.SmoothTransformation
-                )
-            else:
-                # Pour les autres plateformes, utiliser la méthode standard
-                scaled_pixmap = self.current_pixmap.scaled(
-                    target_width, target_height,
-                    Qt.AspectRatioMode.KeepAspectRatio,
-                    Qt.TransformationMode.SmoothTransformation
-                )
-            
-            self.display_pixmap(scaled_pixmap)
+            # Le suréchantillonnage propre à Windows est géré par ImageCanvas
+            self.display_scale()
             self.status_bar.showMessage(f"Zoom: {int(self.current_scale * 100)}% (ajusté à la fenêtre)")
     
     def show_original_size(self):
-        if self.current_pixmap:
+        if self.current_image:
             self.is_fit_to_window = False
             self.current_scale = 1.0
-            self.display_pixmap(self.current_pixmap)
+            self.display_scale()
             self.status_bar.showMessage("Zoom: 100% (taille originale)")
     
+    def closeEvent(self, event):
+        self.path_validator.cancel()
+        self.directory_index.shutdown()
+        self.image_loader.shutdown()
+        self.prefetcher.shutdown()
+        get_thumbnail_service().shutdown()
+        self.data_manager.flush()
+        super().closeEvent(event)
+    
     def resizeEvent(self, event):
         super().resizeEvent(event)
-        if self.current_pixmap and self.is_fit_to_window:
+        if self.current_image and self.is_fit_to_window:
             self.fit_to_window()
     
     def get_center_position(self):
@@ -412,7 +528,7 @@ class HeicViewer(QMainWindow):
         if (obj is self.scroll_area.viewport() and 
             event.type() == event.Type.Wheel and 
             event.modifiers() & Qt.KeyboardModifier.ControlModifier and
-            self.current_pixmap):
+            self.current_image):
             delta = event.angleDelta().y()
             mouse_pos = event.position().toPoint()
             
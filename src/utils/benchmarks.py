@@ -0,0 +1,148 @@
+"""
+Mesures de performance de HeicViewer.
+
+Utilisation :
+    python -m src.utils.benchmarks scanner [--depth 4] [--fanout 4] [--latency 0.005]
+    python -m src.utils.benchmarks thumbnails [--files 64] [--resolution 4000 3000] [--workers 1 2 4 8]
+"""
+import argparse
+import os
+import shutil
+import tempfile
+import time
+from concurrent.futures import wait
+
+from src.core.heic_scanner import HeicScanner, ParallelHeicScanner
+from src.core.thumbnail_service import ThumbnailService
+
+
+def create_synthetic_tree(root, depth, fanout, files_per_directory):
+    """Crée une arborescence de `fanout`^`depth` dossiers remplis de fichiers vides"""
+    directories = [root]
+    for _ in range(depth):
+        next_level = []
+        for directory in directories:
+            for index in range(fanout):
+                subdirectory = os.path.join(directory, f"d{index}")
+                os.mkdir(subdirectory)
+                next_level.append(subdirectory)
+        directories = next_level
+    count = 0
+    for directory, _, _ in os.walk(root):
+        for index in range(files_per_directory):
+            extension = ".heic" if index % 2 == 0 else ".txt"
+            open(os.path.join(directory, f"f{index}{extension}"), "w").close()
+            count += 1
+    return count
+
+
+def _with_latency(scanner_class, latency):
+    """Sous-classe de scanner simulant la latence d'un montage réseau à chaque lecture de dossier"""
+    class LatencyScanner(scanner_class):
+        def _list_directory(self, directory):
+            time.sleep(latency)
+            return super()._list_directory(directory)
+    return LatencyScanner
+
+
+def benchmark_scanners(depth=4, fanout=4, files_per_directory=10, latency=0.005, worker_counts=(2, 4, 8, 16)):
+    """Compare le parcours séquentiel et le parcours parallèle sur un arbre synthétique"""
+    root = tempfile.mkdtemp(prefix="heicviewer-bench-")
+    try:
+        file_count = create_synthetic_tree(root, depth, fanout, files_per_directory)
+        print(f"Arbre synthétique: profondeur {depth}, {fanout} sous-dossiers, "
+              f"{file_count} fichiers, latence {latency * 1000:.1f} ms/dossier")
+
+        runs = [("séquentiel", _with_latency(HeicScanner, latency)(root))]
+        for workers in worker_counts:
+            scanner_class = _with_latency(ParallelHeicScanner, latency)
+            runs.append((f"parallèle x{workers}", scanner_class(root, workers=workers)))
+
+        results = []
+        for name, scanner in runs:
+            start = time.perf_counter()
+            stats = scanner.scan(lambda *match: None)
+            elapsed = time.perf_counter() - start
+            results.append((name, elapsed, stats.matches, stats.dirs_done))
+            print(f"{name:>16}: {elapsed:7.3f} s - {stats.dirs_done} dossiers, {stats.matches} fichiers HEIC")
+        return results
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+def create_synthetic_images(root, count, resolution):
+    """Crée `count` fichiers HEIC sans vignette intégrée : chaque miniature impose un décodage complet"""
+    from PIL import Image
+    width, height = resolution
+    gradient = Image.linear_gradient("L").resize((width, height))
+    image = Image.merge("RGB", (gradient, gradient.transpose(Image.Transpose.ROTATE_180), gradient))
+    first_path = os.path.join(root, "image0.heic")
+    image.save(first_path, quality=80, thumbnails=[])
+    paths = [first_path]
+    for index in range(1, count):
+        path = os.path.join(root, f"image{index}.heic")
+        shutil.copyfile(first_path, path)
+        paths.append(path)
+    return paths
+
+
+def benchmark_thumbnails(file_count=64, resolution=(4000, 3000), size=150, worker_counts=None):
+    """Mesure le débit de génération de miniatures selon le nombre de processus"""
+    cpu_count = os.cpu_count() or 1
+    if not worker_counts:
+        worker_counts = sorted({1, 2, 4, 8, 16, 32, cpu_count} & set(range(1, cpu_count + 1)))
+    root = tempfile.mkdtemp(prefix="heicviewer-bench-")
+    try:
+        paths = create_synthetic_images(root, file_count, resolution)
+        print(f"{file_count} images HEIC {resolution[0]}x{resolution[1]}, miniatures {size} px, "
+              f"{cpu_count} cœurs")
+
+        results = []
+        for workers in worker_counts:
+            # Sans cache disque : chaque miniature est réellement décodée
+            service = ThumbnailService(max_workers=workers)
+            try:
+                # Démarrer les processus avant la mesure
+                wait([service.submit(paths[0], size) for _ in range(workers)])
+                start = time.perf_counter()
+                futures = [service.submit(path, size) for path in paths]
+                wait(futures)
+                elapsed = time.perf_counter() - start
+            finally:
+                service.shutdown()
+            # Seules les miniatures réellement produites comptent dans le débit
+            failures = sum(1 for future in futures if future.exception() is not None)
+            rate = (file_count - failures) / elapsed
+            speedup = rate / results[0][1] if results and results[0][1] else 1.0
+            results.append((workers, rate, failures))
+            failure_info = f", {failures} échecs" if failures else ""
+            print(f"{workers:>4} processus: {rate:8.1f} miniatures/s (x{speedup:.1f}){failure_info}")
+        return results
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Mesures de performance de HeicViewer")
+    subparsers = parser.add_subparsers(dest="benchmark", required=True)
+    scanner_parser = subparsers.add_parser("scanner", help="Parcours séquentiel ou parallèle")
+    scanner_parser.add_argument("--depth", type=int, default=4)
+    scanner_parser.add_argument("--fanout", type=int, default=4)
+    scanner_parser.add_argument("--files", type=int, default=10)
+    scanner_parser.add_argument("--latency", type=float, default=0.005, help="Latence par dossier, en secondes")
+    scanner_parser.add_argument("--workers", type=int, nargs="+", default=[2, 4, 8, 16])
+    thumbnails_parser = subparsers.add_parser("thumbnails", help="Débit du groupe de processus de miniatures")
+    thumbnails_parser.add_argument("--files", type=int, default=64)
+    thumbnails_parser.add_argument("--resolution", type=int, nargs=2, default=[4000, 3000])
+    thumbnails_parser.add_argument("--size", type=int, default=150)
+    thumbnails_parser.add_argument("--workers", type=int, nargs="+", help="Par défaut : puissances de 2 jusqu'au nombre de cœurs")
+    args = parser.parse_args()
+
+    if args.benchmark == "scanner":
+        benchmark_scanners(args.depth, args.fanout, args.files, args.latency, args.workers)
+    elif args.benchmark == "thumbnails":
+        benchmark_thumbnails(args.files, tuple(args.resolution), args.size, args.workers)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+import os
+
+import pytest
+from PIL import Image, ImageCms
+
+from src.core.batch_converter import ConversionOptions, convert_all, convert_file, iter_sources
+
+
+@pytest.fixture
+def source_tree(tmp_path):
+    """Arborescence de petites images HEIC, dont une orientée avec EXIF et profil ICC"""
+    root = tmp_path / "photos"
+    (root / "sub").mkdir(parents=True)
+    image = Image.linear_gradient("L").resize((320, 200)).convert("RGB")
+    exif = Image.Exif()
+    exif[0x0112] = 6
+    exif[0x010f] = "TestCam"
+    icc = ImageCms.ImageCmsProfile(ImageCms.createProfile("sRGB")).tobytes()
+    image.save(root / "oriented.heic", exif=exif.tobytes(), icc_profile=icc)
+    for index in range(5):
+        image.save(root / "sub" / f"image{index}.heic")
+    (root / "notes.txt").write_text("ignoré")
+    return root
+
+
+def test_sources_are_streamed(source_tree):
+    sources = iter_sources([str(source_tree)])
+    # Un générateur : les fichiers sont produits pendant le parcours, sans liste complète
+    assert not isinstance(sources, (list, tuple))
+    assert len(list(sources)) == 6
+
+
+def test_convert_file_keeps_metadata_and_applies_orientation(source_tree, tmp_path):
+    destination = str(tmp_path / "out" / "oriented.jpg")
+    convert_file(str(source_tree / "oriented.heic"), destination, ConversionOptions("jpeg", 85, 100, True))
+    with Image.open(destination) as converted:
+        # Redressée (orientation 6 : rotation d'un quart de tour) puis réduite
+        assert converted.height == 100 and converted.width < converted.height
+        assert converted.getexif().get(0x0112, 1) == 1
+        assert converted.getexif().get(0x010f) == "TestCam"
+        assert converted.info.get("icc_profile")
+
+
+def test_convert_all_mirrors_tree_and_resumes(source_tree, tmp_path):
+    output = tmp_path / "out"
+    options = ConversionOptions("webp", 80, None, True)
+    stats = convert_all([str(source_tree)], options, str(output), max_workers=2)
+    assert (stats.converted, stats.up_to_date, stats.failed) == (6, 0, 0)
+    assert sorted(os.path.relpath(os.path.join(directory, name), output)
+                  for directory, _, names in os.walk(output) for name in names) == sorted(
+        ["oriented.webp"] + [os.path.join("sub", f"image{index}.webp") for index in range(5)])
+
+    # Relance : les sorties à jour sont ignorées, une source modifiée est reconvertie
+    source = source_tree / "sub" / "image0.heic"
+    later = os.stat(output / "sub" / "image0.webp").st_mtime_ns + 10**9
+    os.utime(source, ns=(later, later))
+    stats = convert_all([str(source_tree)], options, str(output), max_workers=2)
+    assert (stats.converted, stats.up_to_date, stats.failed) == (1, 5, 0)
+
+
+def test_convert_all_counts_failures(tmp_path):
+    broken = tmp_path / "broken.heic"
+    broken.write_bytes(b"pas une image")
+    stats = convert_all([str(broken)], ConversionOptions("png", 90, None, True), str(tmp_path / "out"),
+                        max_workers=1)
+    assert stats.failed == 1
+    assert not os.path.exists(tmp_path / "out" / "broken.png")
@@ -0,0 +1,40 @@
+import os
+
+from PyQt6.QtCore import QCoreApplication
+
+from src.core import directory_index
+from src.core.directory_index import DirectoryIndex
+
+HEIF_HEADER = b"\x00\x00\x00\x18ftypheic\x00\x00\x00\x00mif1heic"
+
+
+def test_rescan_sniffs_only_new_or_modified_files(tmp_path, monkeypatch):
+    QCoreApplication.instance() or QCoreApplication([])
+    sniffed = []
+    real_sniff_many = directory_index.sniff_many
+
+    def recording_sniff_many(paths, executor):
+        sniffed.append(sorted(os.path.basename(path) for path in paths))
+        return real_sniff_many(paths, executor)
+
+    monkeypatch.setattr(directory_index, "sniff_many", recording_sniff_many)
+    (tmp_path / "a.heic").write_bytes(HEIF_HEADER)
+    (tmp_path / "disguised.jpg").write_bytes(HEIF_HEADER)
+    (tmp_path / "real.jpg").write_bytes(b"\xff\xd8\xff\xe0" + b"\x00" * 60)
+
+    index = DirectoryIndex(sniff_content=True)
+    try:
+        directory = str(tmp_path)
+        assert [os.path.basename(path) for path in index.files_in(directory)] == ["a.heic", "disguised.jpg"]
+        assert sniffed == [["disguised.jpg", "real.jpg"]]
+
+        (tmp_path / "new.png").write_bytes(HEIF_HEADER)
+        rescanned = index._scan(directory)
+        assert [os.path.basename(path) for path in rescanned] == ["a.heic", "disguised.jpg", "new.png"]
+        assert sniffed[-1] == ["new.png"]
+
+        os.utime(tmp_path / "real.jpg", ns=(1, 1))
+        index._scan(directory)
+        assert sniffed[-1] == ["real.jpg"]
+    finally:
+        index.shutdown()
@@ -0,0 +1,99 @@
+import os
+import threading
+import time
+from collections import deque
+
+import pytest
+
+from src.core.heic_scanner import HeicScanner, ParallelHeicScanner
+
+
+def make_tree(root, depth=3, fanout=3, files_per_directory=4):
+    """Crée une arborescence et retourne l'ensemble des fichiers HEIC attendus"""
+    expected = set()
+    directories = [str(root)]
+    for level in range(depth + 1):
+        next_level = []
+        for directory in directories:
+            for index in range(files_per_directory):
+                extension = ".heic" if index % 2 == 0 else ".txt"
+                path = os.path.join(directory, f"f{index}{extension}")
+                open(path, "w").close()
+                if extension == ".heic":
+                    expected.add(path)
+            if level < depth:
+                for index in range(fanout):
+                    subdirectory = os.path.join(directory, f"d{index}")
+                    os.mkdir(subdirectory)
+                    next_level.append(subdirectory)
+        directories = next_level
+    return expected
+
+
+def collect(scanner):
+    found = []
+    lock = threading.Lock()
+
+    def on_match(path, size, mtime):
+        with lock:
+            found.append(path)
+
+    stats = scanner.scan(on_match, progress_interval=0.01)
+    return found, stats
+
+
+def test_sequential_scan_finds_every_file(tmp_path):
+    expected = make_tree(tmp_path)
+    found, stats = collect(HeicScanner(str(tmp_path)))
+    assert sorted(found) == sorted(expected)
+    assert stats.dirs_done == stats.dirs_discovered == 1 + 3 + 9 + 27
+
+
+@pytest.mark.parametrize("workers", [2, 4, 16])
+def test_parallel_scan_finds_every_file(tmp_path, workers):
+    expected = make_tree(tmp_path)
+    # Répété : une fin prématurée ne se produit que pour certains entrelacements
+    for _ in range(20):
+        found, stats = collect(ParallelHeicScanner(str(tmp_path), workers=workers))
+        assert sorted(found) == sorted(expected)
+        assert stats.dirs_done == stats.dirs_discovered
+
+
+class SlowPublishQueue(deque):
+    """File dont la publication de travail est suivie d'une pause : laisse
+    aux autres threads le temps de voler et terminer les dossiers publiés"""
+
+    def extend(self, items):
+        super().extend(items)
+        if items:
+            time.sleep(0.005)
+
+
+def test_parallel_scan_counts_work_before_publishing_it(tmp_path):
+    expected = make_tree(tmp_path, depth=2, fanout=4)
+    for _ in range(5):
+        scanner = ParallelHeicScanner(str(tmp_path), workers=8)
+        scanner._queues = [SlowPublishQueue() for _ in range(scanner.workers)]
+        found, _ = collect(scanner)
+        assert sorted(found) == sorted(expected)
+
+
+def test_parallel_scan_reports_callback_errors(tmp_path):
+    make_tree(tmp_path, depth=2)
+
+    def on_match(path, size, mtime):
+        raise ValueError("échec du rappel")
+
+    outcome = {}
+
+    def run():
+        try:
+            ParallelHeicScanner(str(tmp_path), workers=4).scan(on_match)
+        except ValueError as e:
+            outcome["error"] = e
+
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    thread.join(timeout=10)
+    assert not thread.is_alive(), "le parcours ne s'est pas terminé"
+    assert "error" in outcome
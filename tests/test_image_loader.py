@@ -0,0 +1,56 @@
+from PIL import Image
+from PyQt6.QtCore import QCoreApplication
+
+from src.core.image_cache import ImageCache
+from src.core.image_loader import AsyncImageLoader
+
+
+def load(loader, path, variant=None):
+    """Exécute une demande de façon synchrone ; retourne l'image émise"""
+    loaded = []
+    loader.image_loaded.connect(lambda request_id, file_path, image, full_size: loaded.append((image, full_size)))
+    loader.latest_request_id += 1
+    loader._load(loader.latest_request_id, path, 100, None, variant)
+    loader.image_loaded.disconnect()
+    return loaded[0]
+
+
+def make_loader():
+    QCoreApplication.instance() or QCoreApplication([])
+    cache = ImageCache(max_memory_mb=64)
+    return cache, AsyncImageLoader(cache, max_workers=1)
+
+
+def test_fitted_revisit_counts_one_hit(tmp_path):
+    path = str(tmp_path / "large.png")
+    Image.new("RGB", (1200, 800), "red").save(path)
+    cache, loader = make_loader()
+    try:
+        image, full_size = load(loader, path, variant=256)
+        assert (image.width(), image.height()) == (256, 171)
+        assert (full_size.width(), full_size.height()) == (1200, 800)
+        load(loader, path, variant=256)
+        stats = cache.stats()
+        assert (stats["misses"], stats["hits"], stats["entries"]) == (1, 1, 1)
+
+        # La pleine résolution en cache sert ensuite l'ajustement, sans échec compté
+        load(loader, path)
+        load(loader, path, variant=256)
+        stats = cache.stats()
+        assert (stats["misses"], stats["hits"], stats["entries"]) == (2, 2, 2)
+    finally:
+        loader.shutdown()
+
+
+def test_small_image_is_cached_once_as_full_resolution(tmp_path):
+    path = str(tmp_path / "small.png")
+    Image.new("RGB", (100, 80), "blue").save(path)
+    cache, loader = make_loader()
+    try:
+        load(loader, path, variant=256)
+        load(loader, path)
+        stats = cache.stats()
+        assert (stats["misses"], stats["hits"], stats["entries"]) == (1, 1, 1)
+        assert stats["memory_mb"] * 1024 * 1024 == 100 * 80 * 4
+    finally:
+        loader.shutdown()
@@ -0,0 +1,55 @@
+import os
+
+from PyQt6.QtCore import QCoreApplication
+
+from src.core.path_validator import PathValidator, _is_under_absent_mount
+
+
+def validate(paths):
+    # Les signaux émis par le thread de vérification passent par la boucle d'événements
+    app = QCoreApplication.instance() or QCoreApplication([])
+    validator = PathValidator(max_workers=4, batch_size=2)
+    missing = []
+    finished = []
+    validator.paths_missing.connect(missing.extend)
+    validator.validation_finished.connect(lambda checked, count: finished.append((checked, count)))
+    validator.start(paths)
+    validator._thread.join(timeout=10)
+    app.processEvents()
+    return sorted(missing), finished
+
+
+def test_reports_only_deleted_files(tmp_path):
+    kept = [str(tmp_path / f"kept{index}.heic") for index in range(3)]
+    for path in kept:
+        open(path, "w").close()
+    deleted = [str(tmp_path / f"deleted{index}.heic") for index in range(3)]
+    missing, finished = validate(kept + deleted)
+    assert missing == sorted(deleted)
+    assert finished == [(6, 3)]
+
+
+def test_deleted_and_emptied_folders_are_reported(tmp_path):
+    (tmp_path / "other").mkdir()
+    deleted = [str(tmp_path / "deleted" / f"image{index}.heic") for index in range(2)]
+    (tmp_path / "emptied").mkdir()
+    emptied = [str(tmp_path / "emptied" / f"image{index}.heic") for index in range(2)]
+    missing, finished = validate(deleted + emptied)
+    assert missing == sorted(deleted + emptied)
+    assert finished == [(4, 4)]
+
+
+def test_missing_mount_keeps_its_paths(tmp_path):
+    # Volume démonté : le point de montage reste, vide, et le dossier de la photo n'existe plus
+    mount_point = tmp_path / "nas"
+    mount_point.mkdir()
+    unmounted = [str(mount_point / "photos" / f"image{index}.heic") for index in range(3)]
+    missing, finished = validate(unmounted)
+    assert missing == []
+    assert finished == [(3, 0)]
+    assert not os.path.exists(unmounted[0])
+
+
+def test_absent_mount_detection():
+    # Le plus proche ancêtre existant est la racine, un point de montage
+    assert _is_under_absent_mount(os.path.join(os.sep, "volume-absent-heicviewer", "photos"))
@@ -0,0 +1,41 @@
+import random
+
+import pytest
+
+from src.core.playlist import Playlist
+
+
+def assert_consistent(playlist):
+    for position, path in enumerate(playlist):
+        assert playlist.index(path) == position
+
+
+def test_ignores_duplicates_and_matches_list_index():
+    playlist = Playlist(["b", "a", "b", "c"])
+    assert playlist == ["b", "a", "c"]
+    assert playlist.index("c") == 2
+    assert "a" in playlist and "z" not in playlist
+    with pytest.raises(ValueError):
+        playlist.index("z")
+
+
+def test_index_follows_insertions_and_removals():
+    paths = [f"/photos/{index:04d}.heic" for index in range(200)]
+    playlist = Playlist(sorted(random.Random(1).sample(paths, 100)))
+    reference = sorted(playlist)
+    rng = random.Random(2)
+    for _ in range(300):
+        path = rng.choice(paths)
+        if path in playlist:
+            assert playlist.remove(path)
+            reference.remove(path)
+        else:
+            assert playlist.insert_sorted(path)
+            reference = sorted(reference + [path])
+        assert playlist == reference
+    assert_consistent(playlist)
+
+    removed = reference[::3] + ["/absent.heic"]
+    assert playlist.remove_many(removed) == len(reference[::3])
+    assert playlist == [path for path in reference if path not in removed]
+    assert_consistent(playlist)
@@ -0,0 +1,54 @@
+import os
+
+from PIL import Image
+
+from src.core.thumbnail_cache import SIZE_CLASSES, ThumbnailCache
+from src.core.thumbnail_service import ThumbnailService
+
+
+def make_images(directory, count, size=300):
+    paths = []
+    for index in range(count):
+        path = os.path.join(directory, f"image{index}.png")
+        # Bruit : des miniatures PNG de taille comparable et peu compressibles
+        Image.frombytes("RGB", (size, size), os.urandom(size * size * 3)).save(path)
+        paths.append(path)
+    return paths
+
+
+def cache_usage(directory):
+    total = 0
+    for size_class in SIZE_CLASSES:
+        class_directory = os.path.join(directory, str(size_class))
+        if os.path.isdir(class_directory):
+            total += sum(entry.stat().st_size for entry in os.scandir(class_directory))
+    return total
+
+
+def test_cache_round_trip_and_invalidation(tmp_path):
+    source = make_images(str(tmp_path), 1)[0]
+    cache = ThumbnailCache(str(tmp_path / "cache"))
+    assert cache.get(source, 150) is None
+    assert cache.put(source, Image.open(source).resize((150, 150)), 150)
+    assert cache.get(source, 150).size == (150, 150)
+    # Une source modifiée invalide sa miniature
+    os.utime(source, (0, 0))
+    assert cache.get(source, 150) is None
+
+
+def test_cache_size_limit_with_several_processes(tmp_path):
+    sources = make_images(str(tmp_path), 40)
+    cache_directory = str(tmp_path / "cache")
+    # Chaque processus écrit moins que le budget, l'ensemble plus du double
+    max_bytes = 1024 * 1024
+    service = ThumbnailService(max_workers=4, cache=ThumbnailCache(cache_directory, max_bytes))
+    try:
+        for future in [service.submit(path, 150) for path in sources]:
+            future.result()
+    finally:
+        # Attendre aussi la prise en compte des écritures, faite à la fin de chaque tâche
+        service.shutdown(wait=True)
+    written = len(sources) * os.path.getsize(next(
+        entry.path for entry in os.scandir(os.path.join(cache_directory, "150"))))
+    assert written > 2 * max_bytes
+    assert cache_usage(cache_directory) <= max_bytes
@@ -0,0 +1,39 @@
+import json
+import threading
+
+from src.core.write_behind import WriteBehindQueue, write_json_atomic
+
+
+def test_flush_writes_in_schedule_order_and_merges_keys():
+    queue = WriteBehindQueue(delay=60)
+    written = []
+    queue.schedule("a", written.append, [1])
+    queue.schedule("b", written.append, [2])
+    queue.schedule("a", written.append, [3], merge=lambda old, new: old + new)
+    assert queue.pending_value("a") == [1, 3]
+    queue.flush()
+    assert written == [[1, 3], [2]]
+    assert queue.pending_value("a") is None
+
+
+def test_value_stays_visible_until_write_commits(tmp_path):
+    file_path = str(tmp_path / "recent.json")
+    write_json_atomic(file_path, ["ancien"])
+    started = threading.Event()
+    release = threading.Event()
+
+    def slow_write(value):
+        started.set()
+        release.wait(5)
+        write_json_atomic(file_path, value)
+
+    queue = WriteBehindQueue(delay=0)
+    queue.schedule("recent", slow_write, ["nouveau"])
+    assert started.wait(5)
+    # Écriture commencée mais pas terminée : la lecture doit voir la nouvelle valeur
+    assert queue.pending_value("recent") == ["nouveau"]
+    release.set()
+    queue.flush()
+    assert queue.pending_value("recent") is None
+    with open(file_path) as f:
+        assert json.load(f) == ["nouveau"]